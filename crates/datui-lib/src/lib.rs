@@ -139,7 +139,7 @@ pub mod tests {
                 } else {
                     panic!(
                         "Python not found. Please install Python 3 to generate test data. \
-                        The script requires: polars>=0.20.0 and numpy>=1.24.0"
+                        The script requires: polars>=1.21.0 and numpy>=1.24.0"
                     );
                 };
 
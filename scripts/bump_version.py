@@ -59,6 +59,7 @@ import argparse
 import re
 import subprocess
 import sys
+import tomllib
 from pathlib import Path
 
 
@@ -271,16 +272,18 @@ def update_readme(file_path: Path, new_version: str) -> None:
 
 def get_current_version(cargo_toml_path: Path) -> str:
     """Extract current version from [package] section of Cargo.toml."""
-    content = cargo_toml_path.read_text()
-    bounds = _package_section_bounds(content)
-    if not bounds:
+    try:
+        with cargo_toml_path.open("rb") as f:
+            data = tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"Could not parse {cargo_toml_path}: {e}") from e
+    package = data.get("package")
+    if not isinstance(package, dict):
         raise ValueError("Could not find [package] section in Cargo.toml")
-    start, end = bounds
-    section = content[start:end]
-    match = re.search(r'version\s*=\s*"([^"]+)"', section)
-    if not match:
+    version = package.get("version")
+    if not isinstance(version, str):
         raise ValueError("Could not find version in [package] of Cargo.toml")
-    return match.group(1)
+    return version
 
 
 def commit_version_changes(project_root: Path, version: str, script_name: str, is_release: bool) -> None:
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Build all documentation locally (tagged releases only, matches production).
 
-Skips building a tag if book/<tag>/.built_sha already matches the tag's current SHA.
-Re-run to only rebuild changed or new tags. Uses a git worktree per tag so the
-repo stays on your current branch.
+Skips building a tag if book/<tag>/.manifest.json or the book/.build_cache.json sidecar
+records the same tag SHA, mdbook version and docs script hash as this run. Re-run to only
+rebuild changed or new tags (or all of them after mdbook or the docs scripts change).
+Builds tags in a single reused git worktree so the repo stays on your current branch.
 
 Prerequisites: mdbook (cargo install mdbook), python3 + scripts/requirements.txt.
 
@@ -16,6 +17,8 @@ To force full rebuild:    rm -rf book && python3 scripts/docs/build_all_docs_loc
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import shutil
 import subprocess
@@ -23,9 +26,29 @@ import sys
 import tempfile
 from pathlib import Path
 
+from build_single_version_docs import MDBOOK_ENV, async_rmtree, find_mdbook, join_rmtree_threads
 
-def run(cmd: list[str], cwd: Path | None = None, check: bool = True) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=check)
+
+BUILD_CACHE_FILE = ".build_cache.json"
+MANIFEST_FILE = ".manifest.json"
+# Scripts from this checkout that shape every tag's output; editing them invalidates all built tags
+DOCS_SCRIPTS = ("build_single_version_docs.py", "generate_command_line_options.py")
+
+
+def run_captured(
+    cmd: list[str], cwd: Path | None = None, check: bool = True, env: dict | None = None
+) -> subprocess.CompletedProcess:
+    """Run cmd and capture stdout/stderr as text (for commands whose output is read)."""
+    return subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True, check=check)
+
+
+def run_quiet(
+    cmd: list[str], cwd: Path | None = None, check: bool = True, env: dict | None = None
+) -> subprocess.CompletedProcess:
+    """Run cmd discarding stdout; only stderr is kept for error reporting."""
+    return subprocess.run(
+        cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=check
+    )
 
 
 def get_repo_root() -> Path:
@@ -55,15 +78,109 @@ def _version_key(tag: str) -> tuple[int, ...]:
     return tuple(nums)
 
 
-def get_version_tags(repo_root: Path) -> list[str]:
-    proc = run(["git", "tag", "-l", "v*"], cwd=repo_root)
-    tags = [t.strip() for t in proc.stdout.strip().splitlines() if t.strip()]
-    return sorted(tags, key=_version_key)
+def _resolve_tags_bulk(repo_root: Path, tags: list[str]) -> dict[str, str]:
+    """Return {tag: sha} for tags, resolved by one git cat-file --batch-check process."""
+    if not tags:
+        return {}
+    proc = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname)"],
+        cwd=repo_root,
+        input="".join(f"refs/tags/{tag}\n" for tag in tags).encode(),
+        capture_output=True,
+        check=True,
+    )
+    # One output line per input line, in order; unknown refs come back as "<name> missing"
+    shas = proc.stdout.decode("ascii").splitlines()
+    return {tag: sha for tag, sha in zip(tags, shas) if not sha.endswith(" missing")}
+
+
+def get_version_tags_with_sha(repo_root: Path) -> list[tuple[str, str]]:
+    """Return [(tag, sha)] for all v* tags, oldest version first, using a single git invocation."""
+    proc = run_captured(
+        ["git", "for-each-ref", "--format=%(refname:strip=2) %(objectname)", "refs/tags/v*"],
+        cwd=repo_root,
+        check=False,
+    )
+    pairs = []
+    if proc.returncode == 0:
+        for line in proc.stdout.splitlines():
+            tag, _, sha = line.strip().partition(" ")
+            if tag and sha:
+                pairs.append((tag, sha))
+    else:
+        # Older git without refname:strip: list the tags, then resolve them all in one batch
+        tags = [t.strip() for t in run_captured(["git", "tag", "-l", "v*"], cwd=repo_root).stdout.splitlines() if t.strip()]
+        pairs = list(_resolve_tags_bulk(repo_root, tags).items())
+    return sorted(pairs, key=lambda pair: _version_key(pair[0]))
+
+
+def checkout_worktree(repo_root: Path, worktree_dir: Path, tag: str) -> subprocess.CompletedProcess:
+    """Switch the existing worktree to tag, cleaning untracked files only if the checkout fails."""
+    cmd = ["git", "-C", str(worktree_dir), "checkout", "--detach", tag]
+    proc = run_quiet(cmd, cwd=repo_root, check=False)
+    if proc.returncode != 0:
+        run_quiet(["git", "-C", str(worktree_dir), "clean", "-xdf"], cwd=repo_root, check=False)
+        proc = run_quiet(cmd[:-1] + ["--force", tag], cwd=repo_root, check=False)
+    return proc
+
+
+def get_mdbook_version(mdbook: str) -> str:
+    proc = run_captured([mdbook, "--version"], check=False)
+    return proc.stdout.strip()
 
 
-def get_tag_sha(repo_root: Path, tag: str) -> str:
-    proc = run(["git", "rev-parse", tag], cwd=repo_root)
-    return proc.stdout.strip()
+def get_docs_script_sha(script_dir: Path) -> str:
+    """Return a short hash of the docs scripts so changes to them trigger a rebuild."""
+    h = hashlib.blake2b()
+    for name in DOCS_SCRIPTS:
+        path = script_dir / name
+        if path.exists():
+            h.update(name.encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _atomic_write_small(path: Path, data: bytes) -> None:
+    """Write data to a temp file next to path, then os.replace it into place (no partial files on crash)."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+def _read_manifest(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _load_cache(book_dir: Path, repo_root: Path) -> dict[str, dict]:
+    """Return the {tag: manifest} map of previously built tags, or {} if missing or for another repo."""
+    try:
+        data = json.loads((book_dir / BUILD_CACHE_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("repo_root") != str(repo_root):
+        return {}
+    tags = data.get("tags")
+    return dict(tags) if isinstance(tags, dict) else {}
+
+
+def _save_cache(book_dir: Path, repo_root: Path, tags: dict[str, dict]) -> None:
+    data = {"repo_root": str(repo_root), "tags": tags}
+    _atomic_write_small(book_dir / BUILD_CACHE_FILE, (json.dumps(data, indent=2, sort_keys=True) + "\n").encode())
+
+
+def _run_build(build_single: Path, tag: str, worktree_dir: Path, env: dict) -> int:
+    """Build one tag's docs with build_single_version_docs.py in the worktree; return its exit code."""
+    return subprocess.run([sys.executable, str(build_single), tag, "--worktree"], cwd=worktree_dir, env=env).returncode
 
 
 def main() -> int:
@@ -74,7 +191,7 @@ def main() -> int:
     book_dir = repo_root / "book"
     book_dir.mkdir(parents=True, exist_ok=True)
 
-    version_tags = get_version_tags(repo_root)
+    version_tags = get_version_tags_with_sha(repo_root)
     if not version_tags:
         print("No v* tags found. Create a tag (e.g. v0.2.22) to build docs.")
         return 1
@@ -83,71 +200,94 @@ def main() -> int:
     print(f"Found {len(version_tags)} version tag(s)")
     print()
 
+    # Resolve mdbook once (fails fast if missing) and hand the path to every per-tag build
+    mdbook = find_mdbook()
+
+    mdbook_version = get_mdbook_version(mdbook)
+    docs_script_sha = get_docs_script_sha(script_dir)
+
+    # The sidecar remembers what was built on earlier runs
+    cached_manifests = _load_cache(book_dir, repo_root)
+    built_manifests: dict[str, dict] = {}
+    built_markers: list[Path] = []
+
     worktree_dir = Path(tempfile.mkdtemp())
-    cleanup_worktree = True
+    worktree_ready = False
     try:
-        for tag in version_tags:
-            tag_sha = get_tag_sha(repo_root, tag)
-            built_sha_file = book_dir / tag / ".built_sha"
-            if built_sha_file.exists() and built_sha_file.read_text().strip() == tag_sha:
-                print(f"  Skipping {tag} (already built for this SHA)")
+        for tag, tag_sha in version_tags:
+            manifest = {
+                "tag": tag,
+                "git_sha": tag_sha,
+                "mdbook_version": mdbook_version,
+                "docs_script_sha": docs_script_sha,
+            }
+            manifest_file = book_dir / tag / MANIFEST_FILE
+            built_markers.append(manifest_file)
+            up_to_date = _read_manifest(manifest_file) == manifest or (
+                cached_manifests.get(tag) == manifest and (book_dir / tag).is_dir()
+            )
+            if up_to_date:
+                built_manifests[tag] = manifest
+                print(f"  Skipping {tag} (already built for this SHA, mdbook and docs scripts)")
                 continue
 
             print(f"  Building {tag}...")
-            # Remove worktree if it exists from a previous iteration
-            worktree_git = worktree_dir / ".git"
-            if worktree_dir.exists() and worktree_git.exists():
-                run(["git", "worktree", "remove", "-f", str(worktree_dir)], cwd=repo_root, check=False)
-                if worktree_dir.exists():
-                    shutil.rmtree(worktree_dir, ignore_errors=True)
-                    worktree_dir.mkdir()
-
-            proc = run(["git", "worktree", "add", str(worktree_dir), tag], cwd=repo_root, check=False)
+            # One worktree for the whole run; later tags only check out the paths that changed
+            if worktree_ready:
+                proc = checkout_worktree(repo_root, worktree_dir, tag)
+            else:
+                proc = run_quiet(["git", "worktree", "add", "--detach", str(worktree_dir), tag], cwd=repo_root, check=False)
+                worktree_ready = proc.returncode == 0
             if proc.returncode != 0:
-                print(f"    Warning: Could not create worktree for {tag}")
+                print(f"    Warning: Could not check out worktree for {tag}")
                 continue
 
             env = os.environ.copy()
             env["DATUI_REPO_ROOT"] = str(repo_root)
-            proc = subprocess.run(
-                [sys.executable, str(build_single), tag, "--worktree"],
-                cwd=worktree_dir,
-                env=env,
-            )
+            env[MDBOOK_ENV] = mdbook
+            if _run_build(build_single, tag, worktree_dir, env) != 0:
+                # No manifest or cache entry, so the next run retries this tag; whatever was built before stays
+                print(f"    Warning: Docs build failed for {tag}; it will be rebuilt on the next run")
+                manifest_file.unlink(missing_ok=True)
+                continue
             (book_dir / tag).mkdir(parents=True, exist_ok=True)
-            (book_dir / tag / ".built_sha").write_text(tag_sha)
+            _atomic_write_small(manifest_file, (json.dumps(manifest, indent=2) + "\n").encode())
+            built_manifests[tag] = manifest
 
-            run(["git", "worktree", "remove", "-f", str(worktree_dir)], cwd=repo_root, check=False)
-            if worktree_dir.exists():
-                shutil.rmtree(worktree_dir, ignore_errors=True)
-                worktree_dir.mkdir()
+        _save_cache(book_dir, repo_root, built_manifests)
 
         print()
         print("Rebuilding index page...")
-        run([sys.executable, str(rebuild_index)], cwd=repo_root)
+        env = os.environ.copy()
+        env["DATUI_REPO_ROOT"] = str(repo_root)
+        run_quiet([sys.executable, str(rebuild_index)], cwd=repo_root, env=env)
 
-        # Copy newest version to latest (stable URL for "current release")
-        latest_tag = version_tags[-1]
+        # Point latest at the newest version (stable URL for "current release"); copy if symlinks are unsupported
+        latest_tag = version_tags[-1][0]
         latest_dir = book_dir / "latest"
-        if latest_dir.exists():
-            shutil.rmtree(latest_dir)
-        shutil.copytree(book_dir / latest_tag, latest_dir)
+        if latest_dir.is_symlink():
+            latest_dir.unlink()
+        elif latest_dir.exists():
+            async_rmtree(latest_dir)
+        try:
+            os.symlink(latest_tag, latest_dir, target_is_directory=True)
+        except OSError:
+            shutil.copytree(book_dir / latest_tag, latest_dir)
+        built_markers.append(latest_dir / MANIFEST_FILE)
         print(f"  Updated latest -> {latest_tag}")
 
         demos_global = book_dir / "demos"
         if demos_global.exists():
-            shutil.rmtree(demos_global)
-
-        for f in book_dir.rglob(".built_sha"):
-            f.unlink()
+            async_rmtree(demos_global)
 
-        cleanup_worktree = False
+        for f in built_markers:
+            f.unlink(missing_ok=True)
     finally:
-        if cleanup_worktree and worktree_dir.exists():
+        if worktree_ready:
             print()
             print("Cleaning up worktree...")
-            run(["git", "worktree", "remove", "-f", str(worktree_dir)], cwd=repo_root, check=False)
-            shutil.rmtree(worktree_dir, ignore_errors=True)
+            run_quiet(["git", "worktree", "remove", "-f", str(worktree_dir)], cwd=repo_root, check=False)
+        shutil.rmtree(worktree_dir, ignore_errors=True)
 
     print()
     print(f"Documentation build complete: {book_dir}")
@@ -161,8 +301,11 @@ def main() -> int:
         try:
             reply = input("Start a local HTTP server? (y/n) ").strip().lower()
             if reply == "y":
-                print("Serving at http://localhost:8000 (Ctrl+C to stop)")
-                subprocess.run([sys.executable, "-m", "http.server", "8000", "--directory", str(book_dir)], cwd=repo_root)
+                print("Serving at http://localhost:8000 (Ctrl+C to stop)", flush=True)
+                # exec replaces this process, so atexit hooks never run: finish pending deletes first
+                join_rmtree_threads()
+                os.chdir(repo_root)
+                os.execvp(sys.executable, [sys.executable, "-m", "http.server", "8000", "--directory", str(book_dir)])
         except (EOFError, KeyboardInterrupt):
             pass
 
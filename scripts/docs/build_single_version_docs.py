@@ -18,18 +18,29 @@ Prerequisites: mdbook (cargo install mdbook). For branch builds, python3 + scrip
 from __future__ import annotations
 
 import argparse
+import atexit
+import functools
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import uuid
 from pathlib import Path
 
 
 OUTPUT_DIR = "book"
+# Set by build_all_docs_local.py so each per-tag build reuses the mdbook path resolved once by the parent
+MDBOOK_ENV = "DATUI_MDBOOK"
 
 
 def get_repo_root(cwd: Path | None = None) -> Path:
+    return _get_repo_root(str((cwd or Path.cwd()).resolve()))
+
+
+@functools.cache
+def _get_repo_root(cwd: str) -> Path:
     env_root = os.environ.get("DATUI_REPO_ROOT")
     if env_root:
         return Path(env_root).resolve()
@@ -39,15 +50,19 @@ def get_repo_root(cwd: Path | None = None) -> Path:
             capture_output=True,
             text=True,
             check=True,
-            cwd=cwd or Path.cwd(),
+            cwd=cwd,
         )
         return Path(r.stdout.strip()).resolve()
     except (subprocess.CalledProcessError, FileNotFoundError):
         return Path.cwd().resolve()
 
 
+@functools.cache
 def find_mdbook() -> str:
     """Return path to mdbook or raise SystemExit."""
+    env_mdbook = os.environ.get(MDBOOK_ENV)
+    if env_mdbook:
+        return env_mdbook
     mdbook = shutil.which("mdbook")
     if mdbook:
         return mdbook
@@ -58,10 +73,84 @@ def find_mdbook() -> str:
     sys.exit(1)
 
 
-def run(cmd: list[str], cwd: Path | None = None, env: dict | None = None) -> subprocess.CompletedProcess:
+def run_captured(cmd: list[str], cwd: Path | None = None, env: dict | None = None) -> subprocess.CompletedProcess:
+    """Run cmd and capture stdout/stderr as text (for commands whose output is read)."""
     return subprocess.run(cmd, cwd=cwd, env=env or os.environ.copy(), capture_output=True, text=True)
 
 
+def _run_ascii(cmd: list[str], cwd: Path | None = None) -> str:
+    """Run cmd and return its stripped stdout decoded as ASCII (for SHAs and other plain output)."""
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, check=True).stdout.strip().decode("ascii")
+
+
+def run_quiet(cmd: list[str], cwd: Path | None = None, env: dict | None = None) -> subprocess.CompletedProcess:
+    """Run cmd discarding stdout; only stderr is kept for error reporting."""
+    return subprocess.run(
+        cmd, cwd=cwd, env=env or os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+
+_rmtree_threads: list[threading.Thread] = []
+
+
+def async_rmtree(path: Path) -> None:
+    """Rename path to a sibling .trash-* dir (one metadata op) and delete it on a background thread."""
+    trash = path.parent / f".trash-{uuid.uuid4().hex}"
+    try:
+        os.rename(path, trash)
+    except OSError:
+        shutil.rmtree(path)
+        return
+    thread = threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}, daemon=True)
+    thread.start()
+    _rmtree_threads.append(thread)
+
+
+@atexit.register
+def join_rmtree_threads() -> None:
+    # Daemon threads die with the interpreter; wait so no .trash-* dirs are left behind
+    for thread in _rmtree_threads:
+        thread.join()
+
+
+def overlay_tree(src: Path, dest: Path) -> None:
+    """Fill dest with symlinks to the entries of src (metadata only; no file contents are copied)."""
+    dest.mkdir(parents=True, exist_ok=True)
+    for entry in src.iterdir():
+        os.symlink(entry, dest / entry.name, target_is_directory=entry.is_dir())
+
+
+def stage_docs(build_dir: Path, docs_temp_path: Path) -> None:
+    """Stage docs/ and book.toml into docs_temp_path as symlinks; copy them where symlinks are unsupported."""
+    try:
+        overlay_tree(build_dir / "docs", docs_temp_path / "docs")
+        os.symlink(build_dir / "book.toml", docs_temp_path / "book.toml")
+    except OSError:
+        shutil.rmtree(docs_temp_path / "docs", ignore_errors=True)
+        (docs_temp_path / "book.toml").unlink(missing_ok=True)
+        shutil.copytree(build_dir / "docs", docs_temp_path / "docs")
+        shutil.copy2(build_dir / "book.toml", docs_temp_path / "book.toml")
+
+
+def materialize_overlay_path(path: Path, root: Path) -> None:
+    """Make path safe to write inside a symlink overlay rooted at root, without touching the source tree.
+
+    Symlinked parent directories become real directories of symlinks to their children, and a
+    symlinked file at path is replaced by a copy of its target.
+    """
+    current = root
+    for part in path.relative_to(root).parts[:-1]:
+        current = current / part
+        if current.is_symlink():
+            target = Path(os.readlink(current))
+            current.unlink()
+            overlay_tree(target, current)
+    if path.is_symlink():
+        target = Path(os.readlink(path))
+        path.unlink()
+        shutil.copy2(target, path)
+
+
 def get_current_branch(cwd: Path | None = None) -> str:
     """Return current branch name, or 'main' if detached / not a repo."""
     try:
@@ -125,8 +214,8 @@ def main() -> int:
 
     if is_tag and not use_worktree:
         try:
-            original_commit = run(["git", "rev-parse", "HEAD"], cwd=repo_root).stdout.strip()
-            original_branch = run(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=repo_root).stdout.strip() or "HEAD"
+            original_commit = _run_ascii(["git", "rev-parse", "HEAD"], cwd=repo_root)
+            original_branch = run_captured(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=repo_root).stdout.strip() or "HEAD"
         except Exception:
             pass
         print(f"Building docs for tag: {version_name}")
@@ -142,20 +231,20 @@ def main() -> int:
     # Clean global demos dir to avoid conflicts
     demos_global = repo_root / OUTPUT_DIR / "demos"
     if demos_global.exists():
-        shutil.rmtree(demos_global)
+        async_rmtree(demos_global)
 
     with tempfile.TemporaryDirectory() as docs_temp:
         docs_temp_path = Path(docs_temp)
-        shutil.copytree(build_dir / "docs", docs_temp_path / "docs")
-        shutil.copy2(build_dir / "book.toml", docs_temp_path / "book.toml")
+        stage_docs(build_dir, docs_temp_path)
 
         # Generate command-line-options.md for non-tag builds
         gen_script = repo_root / "scripts" / "docs" / "generate_command_line_options.py"
         if not is_tag and gen_script.exists():
             print("Generating command line argument docs (can take some time to build)")
             out_md = docs_temp_path / "docs" / "reference" / "command-line-options.md"
+            materialize_overlay_path(out_md, docs_temp_path)
             out_md.parent.mkdir(parents=True, exist_ok=True)
-            proc = run(
+            proc = run_quiet(
                 [sys.executable, str(gen_script), "-o", str(out_md)],
                 cwd=build_dir,
             )
@@ -181,20 +270,20 @@ def main() -> int:
     if demos_src.is_dir():
         demos_dest = output_path / "demos"
         if demos_dest.exists():
-            shutil.rmtree(demos_dest)
+            async_rmtree(demos_dest)
         shutil.copytree(demos_src, demos_dest)
         print(f"Copied demos directory to {version_name}/demos")
     else:
         print(f"  Warning: demos directory not found for {version_name} - skipping")
 
     if demos_global.exists():
-        shutil.rmtree(demos_global)
+        async_rmtree(demos_global)
 
     # Restore original checkout if we switched for a tag
     if is_tag and not use_worktree and original_commit:
         print(f"Returning to original commit: {original_commit}")
         for ref in [original_commit, original_branch, "main"]:
-            ret = subprocess.run(["git", "checkout", ref], cwd=repo_root, capture_output=True)
+            ret = run_quiet(["git", "checkout", ref], cwd=repo_root)
             if ret.returncode == 0:
                 break
         else:
@@ -2,25 +2,64 @@
 """
 Rebuild the index page for the documentation.
 Scans the book directory for version directories: tagged releases (e.g. v0.2.22)
-and development builds (e.g. main). Generates index.html using a Jinja2 template.
+and development builds (e.g. main). Generates index.html from index.html.tmpl.
 """
 
+import functools
 import os
 import subprocess
 import sys
-import re
+import textwrap
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-try:
-    from jinja2 import Environment, FileSystemLoader, TemplateNotFound
-except ImportError:
-    print("Error: jinja2 is required. Install it with: pip install jinja2", file=sys.stderr)
-    sys.exit(1)
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+TEMPLATE_NAME = "index.html.tmpl"
 
+# Placeholders in index.html.tmpl, each on its own line, replaced with the rendered fragments below
+DEMO_MARKER = "<!-- DEMO -->"
+RECENT_VERSIONS_MARKER = "<!-- RECENT_VERSIONS -->"
+OLDER_VERSIONS_MARKER = "<!-- OLDER_VERSIONS -->"
+
+DEMO_IMG = """<img src="{path}/demos/01-basic-navigation.gif"
+     alt="Datui demo showing basic navigation"
+     class="demo-gif"
+     loading="lazy">"""
+
+VERSION_CARD = """<a href="{href}/index.html"
+   class="version-card"
+   role="listitem"
+   data-version="{name}"
+   tabindex="0">
+    <span class="version-name">
+        {name}{badges}
+    </span>
+    <span class="version-date">{date_str}</span>
+</a>"""
+
+LATEST_BADGE = '\n        <span class="version-badge stable">Latest</span>'
+DEVELOPMENT_BADGE = '\n        <span class="version-badge development">Development</span>'
+
+OLDER_VERSIONS_SECTION = """<details class="older-versions" id="older-versions">
+    <summary tabindex="0">Older Versions</summary>
+    <div class="version-list" role="list">
+{cards}
+    </div>
+</details>"""
+
+
+@functools.lru_cache(maxsize=1)
 def get_repo_root() -> Path:
-    """Get the repository root directory."""
+    """Get the repository root directory (DATUI_REPO_ROOT if set by the calling build script)."""
+    env_root = os.environ.get("DATUI_REPO_ROOT")
+    if env_root:
+        return Path(env_root)
+    # Common case: running scripts/docs/rebuild_index.py from inside its own checkout, so no git call needed
+    candidate = SCRIPT_DIR.parent.parent
+    cwd = Path.cwd().resolve()
+    if (candidate / ".git").exists() and (cwd == candidate or candidate in cwd.parents):
+        return candidate
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],
@@ -34,6 +73,13 @@ def get_repo_root() -> Path:
         return Path.cwd()
 
 
+def _run_ascii(cmd: List[str], **kwargs) -> str:
+    """Run cmd and return its stripped stdout, decoded as ASCII (for SHAs, dates and other plain output)."""
+    result = subprocess.run(cmd, capture_output=True, check=True, **kwargs)
+    return result.stdout.strip().decode("ascii")
+
+
+@functools.lru_cache(maxsize=None)
 def get_git_date(ref: str, timezone: str = "UTC") -> Optional[str]:
     """Get the commit date for a git reference in UTC."""
     try:
@@ -41,64 +87,76 @@ def get_git_date(ref: str, timezone: str = "UTC") -> Optional[str]:
         env["TZ"] = timezone
         # Use format-local: to respect TZ environment variable
         # This ensures we get actual UTC time, not local time labeled as UTC
-        result = subprocess.run(
-            ["git", "log", "-1", "--date=format-local:%Y-%m-%d %H:%M UTC", "--format=%ad", ref],
-            capture_output=True,
-            text=True,
+        date_str = _run_ascii(
+            # Trailing "--" makes git treat ref strictly as a revision (never a path), so unknown refs fail
+            ["git", "log", "-1", "--date=format-local:%Y-%m-%d %H:%M UTC", "--format=%ad", ref, "--"],
             env=env,
-            check=False
         )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip()
+        if date_str:
+            return date_str
     except (subprocess.CalledProcessError, FileNotFoundError):
         pass
     return None
 
 
-def check_git_ref_exists(ref: str) -> bool:
-    """Check if a git reference exists."""
-    try:
-        subprocess.run(
-            ["git", "rev-parse", ref],
-            capture_output=True,
-            check=False
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+def load_tag_dates(timezone: str = "UTC") -> Dict[str, str]:
+    """Return {tag: commit date} for every tag, formatted like get_git_date, from one git call.
 
+    Annotated tags are peeled to their commit (*authordate) so the dates match `git log -1 <tag>`.
+    """
+    date_fmt = "format-local:%Y-%m-%d %H:%M UTC"
+    fmt = (
+        "%(refname:strip=2)%00"
+        f"%(if)%(*objectname)%(then)%(*authordate:{date_fmt})%(else)%(authordate:{date_fmt})%(end)"
+    )
+    env = os.environ.copy()
+    env["TZ"] = timezone
+    try:
+        output = _run_ascii(["git", "for-each-ref", f"--format={fmt}", "refs/tags"], env=env)
+    except (subprocess.CalledProcessError, FileNotFoundError, UnicodeDecodeError):
+        return {}
+    dates: Dict[str, str] = {}
+    for line in output.splitlines():
+        name, _, date_str = line.partition("\0")
+        if date_str:
+            dates[name] = date_str
+    return dates
 
-# Match vX.Y.Z or vX.Y (patch 0) or vX (minor/patch 0). No leading zeros in numbers.
-_VERSION_RE = re.compile(r"^v(\d+)\.(\d+)\.(\d+)$|^v(\d+)\.(\d+)$|^v(\d+)$")
 
 # Directory name used as a stable URL for the latest release (copy of newest v* tag). Not listed as its own version.
 LATEST_RELEASE_DIR = "latest"
 
 
 def parse_version(name: str) -> Optional[Tuple[int, int, int]]:
-    """Parse a version string like v1.2.3 into (major, minor, patch). Returns None if not parseable."""
-    m = _VERSION_RE.match(name)
-    if not m:
+    """Parse a version string like v1.2.3 into (major, minor, patch). Returns None if not parseable.
+
+    Accepts vX.Y.Z, vX.Y (patch 0) and vX (minor/patch 0).
+    """
+    if not name.startswith("v"):
         return None
-    g = m.groups()
-    if g[0] is not None:
-        return (int(g[0]), int(g[1]), int(g[2]))
-    if g[3] is not None:
-        return (int(g[3]), int(g[4]), 0)
-    if g[5] is not None:
-        return (int(g[5]), 0, 0)
-    return None
+    parts = name[1:].split(".")
+    if len(parts) > 3 or not all(p.isascii() and p.isdigit() for p in parts):
+        return None
+    nums = [int(p) for p in parts] + [0] * (3 - len(parts))
+    return (nums[0], nums[1], nums[2])
 
 
-def sort_version_dirs(version_dirs: List[Path]) -> List[Path]:
-    """Sort version directories by 3-part semantic version (newest first). Unparseable names last."""
-    def key(path: Path):
-        t = parse_version(path.name)
-        if t is None:
-            return (0, 0, 0)  # put unparseable at end when reverse=True
-        return t
+def sort_version_dirs(version_dirs: List[Path]) -> Tuple[List[Path], List[Path]]:
+    """Split version directories into (parseable, newest first) and (unparseable, by name).
 
-    return sorted(version_dirs, key=key, reverse=True)
+    Unparseable names (e.g. v1.2.3-rc.1) are kept apart so they can never be picked as the latest release.
+    """
+    # Parse each name once, then sort only the valid versions
+    valid: List[Tuple[Tuple[int, int, int], Path]] = []
+    unparseable: List[Path] = []
+    for p in version_dirs:
+        version = parse_version(p.name)
+        if version is None:
+            unparseable.append(p)
+        else:
+            valid.append((version, p))
+    valid.sort(key=lambda item: item[0], reverse=True)
+    return ([p for _, p in valid], sorted(unparseable, key=lambda p: p.name))
 
 
 def _is_release_tag(name: str) -> bool:
@@ -106,6 +164,25 @@ def _is_release_tag(name: str) -> bool:
     return bool(name) and name.startswith("v") and len(name) > 1 and name[1].isdigit()
 
 
+def _atomic_write_small(path: Path, data: bytes) -> None:
+    """Write data to a temp file next to path, then os.replace it into place (no partial files on crash)."""
+    _atomic_write_chunks(path, (data,))
+
+
+def _atomic_write_chunks(path: Path, chunks: Iterable[bytes]) -> None:
+    """Like _atomic_write_small, but writes chunks as they are produced (the whole file is never held in memory)."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
 def collect_versions(output_dir: Path) -> Tuple[List[Dict], List[Dict], Optional[str]]:
     """Collect version directories and return (recent_versions, older_versions, latest_stable_path).
 
@@ -123,13 +200,23 @@ def collect_versions(output_dir: Path) -> Tuple[List[Dict], List[Dict], Optional
     if not output_dir.exists():
         return (recent, older, latest_stable_path)
 
-    all_dirs = [d for d in output_dir.iterdir() if d.is_dir()]
-    tag_dirs = [d for d in all_dirs if _is_release_tag(d.name)]
-    # Development = any dir that is not a release tag and not the "latest" alias
-    dev_dirs = [d for d in all_dirs if d.name != LATEST_RELEASE_DIR and not _is_release_tag(d.name)]
-    sorted_tag_dirs = sort_version_dirs(tag_dirs)
-    if sorted_tag_dirs:
-        latest_stable_path = sorted_tag_dirs[0].name
+    # scandir entries carry the file type from the directory read, so is_dir() needs no extra stat.
+    # Symlinks are not followed: in book/ they are aliases (like latest) and would only duplicate a version.
+    tag_dirs: List[Path] = []
+    dev_dirs: List[Path] = []
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            # Hidden dirs (e.g. .trash-* left by an interrupted build) are never versions
+            if entry.name == LATEST_RELEASE_DIR or entry.name.startswith(".") or not entry.is_dir(follow_symlinks=False):
+                continue
+            if _is_release_tag(entry.name):
+                tag_dirs.append(Path(entry.path))
+            else:
+                # Development = any dir that is not a release tag and not the "latest" alias
+                dev_dirs.append(Path(entry.path))
+    release_dirs, unparseable_dirs = sort_version_dirs(tag_dirs)
+    if release_dirs:
+        latest_stable_path = release_dirs[0].name
 
     # Development entries: main first (if present), then the rest alphabetically
     dev_names = sorted(d.name for d in dev_dirs)
@@ -137,11 +224,8 @@ def collect_versions(output_dir: Path) -> Tuple[List[Dict], List[Dict], Optional
         dev_names = ["main"] + [n for n in dev_names if n != "main"]
     dev_entries: List[Dict] = []
     for version_name in dev_names:
-        date_str = "Development"
-        if check_git_ref_exists(version_name):
-            ref_date = get_git_date(version_name)
-            if ref_date:
-                date_str = ref_date
+        # get_git_date returns None when the dir name is not a ref (e.g. a local-only build)
+        date_str = get_git_date(version_name) or "Development"
         dev_entries.append({
             "name": version_name,
             "path": version_name,
@@ -151,19 +235,18 @@ def collect_versions(output_dir: Path) -> Tuple[List[Dict], List[Dict], Optional
         })
 
     RECENT_TAG_COUNT = 5
+    # One git call dates every tag; a dir whose tag is gone falls back to the generic label
+    tag_dates = load_tag_dates() if tag_dirs else {}
     tag_entries: List[Dict] = []
-    for idx, version_dir in enumerate(sorted_tag_dirs):
+    # Unparseable tag dirs are still listed, after every real release
+    for idx, version_dir in enumerate(release_dirs + unparseable_dirs):
         version_name = version_dir.name
-        date_str = "Release version"
-        if check_git_ref_exists(version_name):
-            tag_date = get_git_date(version_name)
-            if tag_date:
-                date_str = tag_date
+        date_str = tag_dates.get(version_name, "Release version")
         tag_entries.append({
             "name": version_name,
             "path": version_name,
             "is_development": False,
-            "is_latest_stable": idx == 0,
+            "is_latest_stable": idx == 0 and bool(release_dirs),
             "date_str": date_str,
         })
 
@@ -172,6 +255,67 @@ def collect_versions(output_dir: Path) -> Tuple[List[Dict], List[Dict], Optional
     return (recent, older, latest_stable_path)
 
 
+def render_version_card(version: Dict, latest_permanent_path: Optional[str], show_latest_badge: bool) -> str:
+    """Render one version link card. The latest release links to the permanent "latest" path."""
+    is_latest = show_latest_badge and version["is_latest_stable"]
+    href = latest_permanent_path if is_latest and latest_permanent_path else version["path"]
+    badges = ""
+    if is_latest:
+        badges += LATEST_BADGE
+    if version["is_development"]:
+        badges += DEVELOPMENT_BADGE
+    return VERSION_CARD.format(href=href, name=version["name"], badges=badges, date_str=version["date_str"])
+
+
+def iter_index_chunks(
+    template: str,
+    recent_versions: List[Dict],
+    older_versions: List[Dict],
+    latest_stable_path: Optional[str],
+    latest_permanent_path: Optional[str],
+) -> Iterator[str]:
+    """Yield the index page in order: template text between markers, and each marker's fragment.
+
+    Each marker line is replaced by its fragment, indented like the marker.
+    """
+    demo = ""
+    if latest_stable_path:
+        demo = DEMO_IMG.format(path=latest_permanent_path or latest_stable_path)
+    recent = "\n".join(render_version_card(v, latest_permanent_path, True) for v in recent_versions)
+    older = ""
+    if older_versions:
+        cards = "\n".join(render_version_card(v, latest_permanent_path, False) for v in older_versions)
+        older = OLDER_VERSIONS_SECTION.format(cards=textwrap.indent(cards, " " * 8))
+    fragments = {DEMO_MARKER: demo, RECENT_VERSIONS_MARKER: recent, OLDER_VERSIONS_MARKER: older}
+
+    pos = 0
+    for marker_pos, marker in sorted((template.index(m), m) for m in fragments):
+        line_start = template.rindex("\n", 0, marker_pos) + 1
+        yield template[pos:line_start]
+        yield textwrap.indent(fragments[marker], template[line_start:marker_pos])
+        pos = marker_pos + len(marker)
+    yield template[pos:]
+
+
+def render_index(
+    template: str,
+    recent_versions: List[Dict],
+    older_versions: List[Dict],
+    latest_stable_path: Optional[str],
+    latest_permanent_path: Optional[str],
+) -> str:
+    """Render the index page from the template text and collected versions."""
+    return "".join(
+        iter_index_chunks(template, recent_versions, older_versions, latest_stable_path, latest_permanent_path)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(template_file: Path) -> str:
+    """Read the index template once per process; repeated renders reuse the cached text."""
+    return template_file.read_text(encoding="utf-8")
+
+
 def main():
     """Main function to rebuild the index page."""
     repo_root = get_repo_root()
@@ -181,23 +325,12 @@ def main():
     output_dir.mkdir(exist_ok=True)
 
     # Locate the template file
-    script_dir = Path(__file__).parent
-    template_file = script_dir / "index.html.j2"
-
-    if not template_file.exists():
-        print(f"Error: Template file not found: {template_file}", file=sys.stderr)
-        sys.exit(1)
-
-    # Set up Jinja2 environment
-    env = Environment(
-        loader=FileSystemLoader(str(script_dir)),
-        autoescape=False
-    )
+    template_file = SCRIPT_DIR / TEMPLATE_NAME
 
     try:
-        template = env.get_template("index.html.j2")
-    except TemplateNotFound:
-        print(f"Error: Could not load template: {template_file}", file=sys.stderr)
+        template = load_template(template_file)
+    except OSError:
+        print(f"Error: Template file not found: {template_file}", file=sys.stderr)
         sys.exit(1)
 
     # Collect version information (releases v* and development branch dirs)
@@ -208,17 +341,17 @@ def main():
     # CI copies the current release to book/latest so this link works on GitHub Pages.
     latest_permanent_path = "latest"
 
-    # Render the template
-    output_html = template.render(
+    chunks = iter_index_chunks(
+        template,
         recent_versions=recent_versions,
         older_versions=older_versions,
         latest_stable_path=latest_stable_path,
         latest_permanent_path=latest_permanent_path,
     )
 
-    # Write the output file
+    # Stream the rendered chunks to the output file
     output_file = output_dir / "index.html"
-    output_file.write_text(output_html, encoding="utf-8")
+    _atomic_write_chunks(output_file, (chunk.encode("utf-8") for chunk in chunks))
 
     print("Index page regenerated")
 
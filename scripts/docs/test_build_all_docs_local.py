@@ -0,0 +1,45 @@
+"""Tests for the build skip cache in build_all_docs_local.py."""
+
+import json
+import subprocess
+
+import build_all_docs_local
+
+
+def _patch_build(monkeypatch, repo_root, build_returncode):
+    """Stub git and mdbook so main() builds one tag, with build_single_version_docs.py exiting build_returncode."""
+    monkeypatch.setattr(build_all_docs_local, "get_repo_root", lambda: repo_root)
+    monkeypatch.setattr(build_all_docs_local, "get_version_tags_with_sha", lambda root: [("v0.1.0", "abc123")])
+    monkeypatch.setattr(build_all_docs_local, "find_mdbook", lambda: "mdbook")
+    monkeypatch.setattr(build_all_docs_local, "get_mdbook_version", lambda mdbook: "mdbook v0.5.2")
+    monkeypatch.setattr(
+        build_all_docs_local, "run_quiet", lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0)
+    )
+    monkeypatch.setattr(build_all_docs_local, "_run_build", lambda *args: build_returncode)
+
+
+def _cached_tags(book_dir):
+    return json.loads((book_dir / build_all_docs_local.BUILD_CACHE_FILE).read_text())["tags"]
+
+
+def test_successful_build_is_cached(tmp_path, monkeypatch):
+    """A tag whose build succeeds is recorded in the sidecar so later runs skip it."""
+    _patch_build(monkeypatch, tmp_path, build_returncode=0)
+
+    assert build_all_docs_local.main() == 0
+    assert "v0.1.0" in _cached_tags(tmp_path / "book")
+
+
+def test_failed_build_leaves_no_cache_entry(tmp_path, monkeypatch):
+    """A tag whose build fails must not be recorded, so the next run retries it."""
+    book_dir = tmp_path / "book"
+    _patch_build(monkeypatch, tmp_path, build_returncode=0)
+    build_all_docs_local.main()
+
+    # Invalidate the entry (as a new mdbook version would), then fail the rebuild
+    _patch_build(monkeypatch, tmp_path, build_returncode=1)
+    monkeypatch.setattr(build_all_docs_local, "get_mdbook_version", lambda mdbook: "mdbook v0.5.3")
+
+    assert build_all_docs_local.main() == 0
+    assert "v0.1.0" not in _cached_tags(book_dir)
+    assert not (book_dir / "v0.1.0" / build_all_docs_local.MANIFEST_FILE).exists()
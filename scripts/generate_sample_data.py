@@ -14,17 +14,26 @@ This script generates various CSV, Parquet, IPC/Arrow, Avro, and Excel files:
 - Pivot and Melt reshape testing (long-format for pivot, wide-format for melt)
 - Correlation matrix demo (100k rows, 10 numeric columns with varying correlations)
 
-Uses Polars for most formats; fastavro for Avro; openpyxl for Excel.
+Uses Polars for most formats; fastavro for Avro; openpyxl for Excel; isal (if installed) for faster gzip.
 """
 
+import argparse
+import functools
+import hashlib
+import inspect
+import json
+import multiprocessing
 import os
+import shutil
+import string
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from tkinter import W
 import polars as pl
 import numpy as np
 from datetime import date, datetime, timedelta
-import random
 import gzip
 
 # Optional deps for extra formats (fail gracefully if missing)
@@ -36,15 +45,62 @@ try:
     import openpyxl
 except ImportError:
     openpyxl = None
+# ISA-L's SIMD deflate is a drop-in for gzip.open and several times faster (levels 0-3 only).
+# Level 1 either way: these are test fixtures, and on large_dataset.csv.gz stdlib level 1 is ~5x faster than
+# level 6 for ~11% more bytes.
+try:
+    from isal.igzip import open as gzip_open
+except ImportError:
+    gzip_open = gzip.open
+GZIP_LEVEL = 1
 
 # Output directory
 OUTPUT_DIR = Path(__file__).parent.parent / "tests" / "sample-data"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def generate_people_data():
+# Records, per task, a hash of the code that produced its files and which files it wrote, so unchanged tasks
+# can be skipped on rerun. Machine-local state, so it is gitignored.
+STAMP_FILE = OUTPUT_DIR / ".generated.json"
+
+# Files written by the task currently running in this process (see _run_task)
+_written = []
+_written_lock = threading.Lock()
+
+
+def _generated(path):
+    """Report a written file and record it for the current task's stamp entry."""
+    with _written_lock:
+        _written.append(Path(path).name)
+    print(f"Generated: {path}")
+
+def _with_random_nulls(df, rng, columns, null_count):
+    """Return df with null_count random rows of each column set to null.
+
+    Nulls are scattered at the drawn row indices, so no mask or conditional column is built.
+    """
+    n = df.height
+    # scatter() requires sorted indices for some dtypes; sorting does not change which rows are hit, and since the
+    # order is discarded anyway choice() can skip its final shuffle
+    null_idx = {
+        col: np.sort(rng.choice(n, size=null_count, replace=False, shuffle=False)).astype(np.uint32)
+        for col in columns
+    }
+    # One with_columns for all columns, so the frame is rebuilt once rather than once per column
+    return df.with_columns(df.get_column(col).scatter(idx, None) for col, idx in null_idx.items())
+
+
+def _choose(rng, values, n):
+    """Draw n items uniformly from a list of strings as a String Series.
+
+    Draws integer indices and gathers in Polars, so no NumPy object array of Python strings is built.
+    """
+    return pl.Series(values).gather(rng.integers(0, len(values), n))
+
+
+def generate_people_data(rng=None):
     """Generate a people database with cities, states, etc. for grouping."""
-    np.random.seed(42)
-    random.seed(42)
+    if rng is None:
+        rng = np.random.default_rng(42)
 
     cities = ["Springfield", "Riverside", "Franklin", "Greenville", "Bristol",
               "Madison", "Clinton", "Marion", "Georgetown", "Salem"]
@@ -53,41 +109,27 @@ def generate_people_data():
     job_titles = ["Manager", "Senior", "Junior", "Lead", "Director", "Analyst"]
 
     n = 1000
+    # Both name columns share one id-string column, built in Polars
+    id_str = pl.int_range(1, n + 1, eager=True).cast(pl.Utf8)
     data = {
-        "id": list(range(1, n + 1)),
-        "first_name": [f"Person{i}" for i in range(1, n + 1)],
-        "last_name": [f"Lastname{i}" for i in range(1, n + 1)],
-        "age": np.random.randint(22, 65, n).tolist(),
-        "city": np.random.choice(cities, n).tolist(),
-        "state": np.random.choice(states, n).tolist(),
-        "department": np.random.choice(departments, n).tolist(),
-        "job_title": np.random.choice(job_titles, n).tolist(),
-        "salary": np.random.randint(40000, 150000, n).tolist(),
-        "start_date": [(datetime(2020, 1, 1) + timedelta(days=random.randint(0, 1460))).date() for _ in range(n)],
-        "active": np.random.choice([True, False], n, p=[0.8, 0.2]).tolist(),
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "first_name": "Person" + id_str,
+        "last_name": "Lastname" + id_str,
+        "age": rng.integers(22, 65, n),
+        "city": _choose(rng, cities, n),
+        "state": _choose(rng, states, n),
+        "department": _choose(rng, departments, n),
+        "job_title": _choose(rng, job_titles, n),
+        "salary": rng.integers(40000, 150000, n),
+        "start_date": np.datetime64("2020-01-01") + rng.integers(0, 1461, n).astype("timedelta64[D]"),
+        "active": rng.choice([True, False], n, p=[0.8, 0.2]),
     }
 
     df = pl.DataFrame(data)
 
-    # Add some nulls - create a mask for each column
+    # Add some nulls - random rows per column, applied in a single with_columns
     null_count = int(n * 0.1)
-    for col in ["city", "department", "salary"]:
-        null_indices = set(np.random.choice(n, size=null_count, replace=False))
-        mask = [i in null_indices for i in range(n)]
-        if col == "salary":
-            df = df.with_columns(
-                pl.when(pl.Series("mask", mask))
-                .then(None)
-                .otherwise(pl.col(col))
-                .alias(col)
-            )
-        else:
-            df = df.with_columns(
-                pl.when(pl.Series("mask", mask))
-                .then(None)
-                .otherwise(pl.col(col))
-                .alias(col)
-            )
+    df = _with_random_nulls(df, rng, ["city", "department", "salary"], null_count)
 
     return df
 
@@ -101,80 +143,59 @@ def save_infer_schema_length_data(data, filename):
     path = OUTPUT_DIR / filename
     with open(path, "w") as f:
         f.writelines(("\n".join(data)))
-    print(f"Generated: {path}")
+    _generated(path)
 
-def generate_sales_data():
+def generate_sales_data(rng=None):
     """Generate sales data for aggregate calculations."""
-    np.random.seed(43)
-    random.seed(43)
+    if rng is None:
+        rng = np.random.default_rng(43)
 
     products = ["Widget A", "Widget B", "Widget C", "Gadget X", "Gadget Y", "Tool 1", "Tool 2"]
     regions = ["North", "South", "East", "West", "Central"]
 
     n = 5000
     data = {
-        "date": [(datetime(2023, 1, 1) + timedelta(days=random.randint(0, 730))).date() for _ in range(n)],
-        "product": np.random.choice(products, n).tolist(),
-        "region": np.random.choice(regions, n).tolist(),
-        "quantity": np.random.randint(1, 100, n).tolist(),
-        "unit_price": [round(random.uniform(10.0, 500.0), 2) for _ in range(n)],
-        "discount": [round(random.uniform(0.0, 0.3), 2) for _ in range(n)],
+        "date": np.datetime64("2023-01-01") + rng.integers(0, 731, n).astype("timedelta64[D]"),
+        "product": _choose(rng, products, n),
+        "region": _choose(rng, regions, n),
+        "quantity": rng.integers(1, 100, n),
+        "unit_price": np.round(rng.uniform(10.0, 500.0, n), 2),
+        "discount": np.round(rng.uniform(0.0, 0.3, n), 2),
     }
 
     df = pl.DataFrame(data)
-    df = df.with_columns(
-        (pl.col("quantity") * pl.col("unit_price") * (1 - pl.col("discount"))).alias("total")
-    )
 
     # Add some nulls
     null_count = int(n * 0.05)
-    for col in ["quantity", "unit_price", "discount"]:
-        null_indices = set(np.random.choice(n, size=null_count, replace=False))
-        mask = [i in null_indices for i in range(n)]
-        df = df.with_columns(
-            pl.when(pl.Series("mask", mask))
-            .then(None)
-            .otherwise(pl.col(col))
-            .alias(col)
-        )
-
-    # Recalculate total where we have nulls
+    df = _with_random_nulls(df, rng, ["quantity", "unit_price", "discount"], null_count)
+
+    # Compute total once, after the nulls are in; arithmetic propagates them
     df = df.with_columns(
-        pl.when(pl.col("quantity").is_null() | pl.col("unit_price").is_null() | pl.col("discount").is_null())
-        .then(None)
-        .otherwise(pl.col("quantity") * pl.col("unit_price") * (1 - pl.col("discount")))
-        .alias("total")
+        (pl.col("quantity") * pl.col("unit_price") * (1 - pl.col("discount"))).alias("total")
     )
 
     return df
 
-def generate_mixed_types():
+def generate_mixed_types(rng=None):
     """Generate data with various types including nulls."""
-    np.random.seed(44)
+    if rng is None:
+        rng = np.random.default_rng(44)
 
     n = 200
     data = {
-        "id": list(range(1, n + 1)),
-        "integer_col": np.random.randint(-100, 100, n).tolist(),
-        "float_col": [round(random.uniform(-50.0, 50.0), 3) for _ in range(n)],
-        "string_col": [f"text_{i}" for i in range(n)],
-        "boolean_col": np.random.choice([True, False], n).tolist(),
-        "date_col": [(datetime(2020, 1, 1) + timedelta(days=i)).date() for i in range(n)],
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "integer_col": rng.integers(-100, 100, n),
+        "float_col": np.round(rng.uniform(-50.0, 50.0, n), 3),
+        "string_col": "text_" + pl.int_range(0, n, eager=True).cast(pl.Utf8),
+        "boolean_col": rng.choice([True, False], n),
+        "date_col": np.datetime64("2020-01-01") + np.arange(n).astype("timedelta64[D]"),
     }
 
     df = pl.DataFrame(data)
 
     # Add nulls to various columns
     null_count = int(n * 0.15)
-    for col in ["integer_col", "float_col", "string_col", "boolean_col", "date_col"]:
-        null_indices = set(np.random.choice(n, size=null_count, replace=False))
-        mask = [i in null_indices for i in range(n)]
-        df = df.with_columns(
-            pl.when(pl.Series("mask", mask))
-            .then(None)
-            .otherwise(pl.col(col))
-            .alias(col)
-        )
+    df = _with_random_nulls(df, rng, ["integer_col", "float_col", "string_col", "boolean_col", "date_col"], null_count)
 
     return df
 
@@ -223,10 +244,20 @@ def generate_single_row():
     df = pl.DataFrame(data)
     return df
 
-def generate_large_dataset():
-    """Generate a large dataset for performance testing with various distributions."""
-    np.random.seed(45)
-    random.seed(45)
+
+# All 2-letter combinations (AA, AB, ..., ZZ) = 26*26 = 676 categories for the large dataset
+_LARGE_DATASET_CATEGORIES = tuple(a + b for a in string.ascii_uppercase for b in string.ascii_uppercase)
+
+
+def generate_large_dataset(rng=None):
+    """Generate a large dataset for performance testing with various distributions.
+
+    rng is a legacy np.random.RandomState rather than a Generator: this dataset keeps NumPy's legacy stream
+    (seed 45, same draw order and samplers as the original per-element version) so the dist_* columns are the
+    data tests/distribution_detection_test.rs was written against.
+    """
+    if rng is None:
+        rng = np.random.RandomState(45)
 
     n = 1000000
 
@@ -234,100 +265,137 @@ def generate_large_dataset():
     # Preserve distribution characteristics for proper detection testing
 
     # Normal distribution (can have negative values) - keep natural scale
-    normal_data = np.random.normal(loc=0.0, scale=1.0, size=n)
+    normal_data = rng.normal(loc=0.0, scale=1.0, size=n)
 
     # LogNormal distribution (positive values) - keep natural scale
-    lognormal_data = np.random.lognormal(mean=0.0, sigma=1.0, size=n)
+    lognormal_data = rng.lognormal(mean=0.0, sigma=1.0, size=n)
 
     # Uniform distribution - keep in [0, 1] (natural for uniform)
-    uniform_data = np.random.uniform(0.0, 1.0, n)
+    uniform_data = rng.uniform(0.0, 1.0, n)
 
     # Power Law distribution (positive values) - keep natural scale
     # Generate using inverse transform: x = xmin * (1 - u)^(-1/(alpha-1))
     # where u is uniform [0,1] and alpha > 1
     alpha = 2.5
     xmin = 1.0  # Start from 1.0 for better power-law characteristics
-    powerlaw_data = xmin * np.power(1.0 - np.random.uniform(0.0, 1.0, n), -1.0 / (alpha - 1.0))
+    powerlaw_data = xmin * np.power(1.0 - rng.uniform(0.0, 1.0, n), -1.0 / (alpha - 1.0))
 
     # Exponential distribution (positive values) - keep natural scale
     lambda_param = 2.0
-    exponential_data = np.random.exponential(scale=1.0/lambda_param, size=n)
+    exponential_data = rng.exponential(scale=1.0/lambda_param, size=n)
 
     # Beta distribution - naturally in [0, 1], keep as is
-    beta_data = np.random.beta(a=2.0, b=5.0, size=n)
+    beta_data = rng.beta(a=2.0, b=5.0, size=n)
 
     # Gamma distribution (positive values) - keep natural scale
     shape = 2.0
     scale = 0.5
-    gamma_data = np.random.gamma(shape=shape, scale=scale, size=n)
+    gamma_data = rng.gamma(shape=shape, scale=scale, size=n)
 
     # Chi-squared distribution (non-negative) - keep natural scale
     df = 5.0
-    chisq_data = np.random.chisquare(df=df, size=n)
+    chisq_data = rng.chisquare(df=df, size=n)
 
     # Student's t distribution (can have negative values) - keep natural scale
     t_df = 5.0
-    t_data = np.random.standard_t(df=t_df, size=n)
+    t_data = rng.standard_t(df=t_df, size=n)
 
     # Poisson distribution (non-negative integers) - KEEP AS INTEGERS
     lambda_poisson = 5.0
-    poisson_data = np.random.poisson(lam=lambda_poisson, size=n).astype(int)
+    poisson_data = rng.poisson(lam=lambda_poisson, size=n).astype(np.int64)
 
     # Bernoulli distribution - KEEP AS BINARY INTEGERS [0, 1]
     p_bernoulli = 0.3
-    bernoulli_data = np.random.binomial(n=1, p=p_bernoulli, size=n).astype(int)
+    bernoulli_data = rng.binomial(n=1, p=p_bernoulli, size=n).astype(np.int64)
 
     # Binomial distribution (non-negative integers) - KEEP AS INTEGERS
     n_binomial = 20
     p_binomial = 0.4
-    binomial_data = np.random.binomial(n=n_binomial, p=p_binomial, size=n).astype(int)
+    binomial_data = rng.binomial(n=n_binomial, p=p_binomial, size=n).astype(np.int64)
 
     # Geometric distribution (non-negative integers) - KEEP AS INTEGERS
     p_geometric = 0.3
-    geometric_data = np.random.geometric(p=p_geometric, size=n).astype(int)
+    geometric_data = rng.geometric(p=p_geometric, size=n).astype(np.int64)
 
     # Weibull distribution (positive values) - keep natural scale
     weibull_shape = 2.0
     weibull_scale = 1.0
-    weibull_data = weibull_scale * np.power(-np.log(np.random.uniform(0.001, 1.0, n)), 1.0 / weibull_shape)
+    weibull_data = weibull_scale * np.power(-np.log(rng.uniform(0.001, 1.0, n)), 1.0 / weibull_shape)
 
-    # Generate all 2-letter combinations (AA, AB, ..., ZZ) = 26*26 = 676 categories
-    categories = [f"{chr(65+i)}{chr(65+j)}" for i in range(26) for j in range(26)]
+    categories = _LARGE_DATASET_CATEGORIES
     num_categories = len(categories)
 
     # Generate power-law distributed categories
-    power_law_values = np.random.power(a=1.5, size=n)   # 1.5 alpha for power law
-    category_indices = (power_law_values * num_categories).astype(int)
-    category_indices = np.clip(category_indices, 0, num_categories - 1)
-    category_data = [categories[idx] for idx in category_indices]
-
+    power_law_values = rng.power(a=1.5, size=n)   # 1.5 alpha for power law
+    # 676 categories fit in uint16: a quarter of the index memory of int64, and clipped in place
+    category_indices = (power_law_values * num_categories).astype(np.uint16)
+    np.minimum(category_indices, num_categories - 1, out=category_indices)
+    category_data = pl.Series(categories).gather(category_indices)
+
+    # Continuous distributions: round to 6 decimal places in place, so no second 8 MB array per column
+    for arr in (
+        normal_data,
+        lognormal_data,
+        uniform_data,
+        powerlaw_data,
+        exponential_data,
+        beta_data,
+        gamma_data,
+        chisq_data,
+        t_data,
+        weibull_data,
+    ):
+        np.round(arr, 6, out=arr)
+
+    value1 = rng.randint(0, 1000, n)
+    value3 = rng.choice([True, False], n)
+    # Drawn last so the columns above keep their original values
+    value2 = np.round(rng.uniform(0.0, 100.0, n), 2)
+
+    # Typed NumPy buffers go straight into Arrow memory; no intermediate Python lists
     data = {
-        "id": list(range(1, n + 1)),
+        "id": np.arange(1, n + 1, dtype=np.int64),
         "category": category_data,
-        "value1": np.random.randint(0, 1000, n).tolist(),
-        "value2": [round(random.uniform(0.0, 100.0), 2) for _ in range(n)],
-        "value3": np.random.choice([True, False], n).tolist(),
-        "timestamp": [datetime(2024, 1, 1) + timedelta(seconds=i) for i in range(n)],
+        "value1": value1,
+        "value2": value2,
+        "value3": value3,
+        # One row per second, built directly in Polars (no int64 -> timedelta64 -> datetime64 intermediates)
+        "timestamp": pl.datetime_range(
+            datetime(2024, 1, 1), datetime(2024, 1, 1) + timedelta(seconds=n - 1), "1s", time_unit="us", eager=True
+        ),
         # Distribution columns
-        # Continuous distributions: round to 6 decimal places
-        "dist_normal": [round(float(x), 6) for x in normal_data],
-        "dist_lognormal": [round(float(x), 6) for x in lognormal_data],
-        "dist_uniform": [round(float(x), 6) for x in uniform_data],
-        "dist_powerlaw": [round(float(x), 6) for x in powerlaw_data],
-        "dist_exponential": [round(float(x), 6) for x in exponential_data],
-        "dist_beta": [round(float(x), 6) for x in beta_data],
-        "dist_gamma": [round(float(x), 6) for x in gamma_data],
-        "dist_chisquared": [round(float(x), 6) for x in chisq_data],
-        "dist_students_t": [round(float(x), 6) for x in t_data],
-        "dist_weibull": [round(float(x), 6) for x in weibull_data],
-        # Discrete distributions: keep as integers (no rounding needed, but convert to list)
-        "dist_poisson": poisson_data.tolist(),
-        "dist_bernoulli": bernoulli_data.tolist(),
-        "dist_binomial": binomial_data.tolist(),
-        "dist_geometric": geometric_data.tolist(),
+        # Continuous distributions (rounded to 6 decimal places above)
+        "dist_normal": normal_data,
+        "dist_lognormal": lognormal_data,
+        "dist_uniform": uniform_data,
+        "dist_powerlaw": powerlaw_data,
+        "dist_exponential": exponential_data,
+        "dist_beta": beta_data,
+        "dist_gamma": gamma_data,
+        "dist_chisquared": chisq_data,
+        "dist_students_t": t_data,
+        "dist_weibull": weibull_data,
+        # Discrete distributions: keep as integers (no rounding needed)
+        "dist_poisson": poisson_data,
+        "dist_bernoulli": bernoulli_data,
+        "dist_binomial": binomial_data,
+        "dist_geometric": geometric_data,
     }
 
-    df = pl.DataFrame(data)
+    # Explicit dtypes: Polars builds each column at its final type without inferring it first
+    schema = {
+        "id": pl.Int64,
+        "category": pl.Utf8,
+        "value1": pl.Int64,
+        "value2": pl.Float64,
+        "value3": pl.Boolean,
+        "timestamp": pl.Datetime("us"),
+    }
+    for name in data:
+        if name.startswith("dist_"):
+            schema[name] = pl.Int64 if data[name].dtype.kind == "i" else pl.Float64
+
+    df = pl.DataFrame(data, schema=schema)
     return df
 
 def generate_error_cases():
@@ -361,7 +429,7 @@ def generate_error_cases():
 # -----------------------------------------------------------------------------
 
 
-def generate_pivot_long():
+def generate_pivot_long(rng=None):
     """
     Long-format data for Pivot tab testing.
 
@@ -370,60 +438,56 @@ def generate_pivot_long():
     - Some (id, date, key) duplicates to exercise aggregation (last, first, min, max, etc.).
     - Deterministic (seed 50) for reproducible tests.
     """
-    np.random.seed(50)
-    random.seed(50)
+    if rng is None:
+        rng = np.random.default_rng(50)
 
     keys = ["A", "B", "C"]
     n_groups = 40
-    base_date = datetime(2024, 1, 1).date()
 
-    rows = []
-    for g in range(n_groups):
-        uid = (g % 20) + 1
-        d = base_date + timedelta(days=g % 31)
-        for k in keys:
-            rows.append({"id": uid, "date": d, "key": k, "value": round(random.uniform(10.0, 100.0), 2)})
+    # One row per (group, key), group-major
+    g = np.arange(n_groups)
+    n = n_groups * len(keys)
+    df = pl.DataFrame({
+        "id": np.repeat(g % 20 + 1, len(keys)),
+        "date": np.repeat(np.datetime64("2024-01-01") + (g % 31).astype("timedelta64[D]"), len(keys)),
+        "key": keys * n_groups,
+        "value": np.round(rng.uniform(10.0, 100.0, n), 2),
+    })
 
     # Add duplicates for aggregation tests: same (id, date, key), different value
     n_dup = 24
-    for _ in range(n_dup):
-        r = random.choice(rows)
-        rows.append({
-            "id": r["id"],
-            "date": r["date"],
-            "key": r["key"],
-            "value": round(random.uniform(10.0, 100.0), 2),
-        })
+    dups = df[rng.integers(0, n, n_dup)].with_columns(
+        pl.Series("value", np.round(rng.uniform(10.0, 100.0, n_dup), 2))
+    )
 
-    return pl.DataFrame(rows)
+    return pl.concat([df, dups])
 
 
-def generate_pivot_long_string():
+def generate_pivot_long_string(rng=None):
     """
     Long-format data with string value column for Pivot + first/last aggregation.
 
     Schema: id, date, key, value (str). Same structure as pivot_long; value is
     "low", "mid", or "high" so only first/last aggregation is meaningful.
     """
-    np.random.seed(51)
-    random.seed(51)
+    if rng is None:
+        rng = np.random.default_rng(51)
 
     keys = ["X", "Y", "Z"]
     labels = ["low", "mid", "high"]
     n_groups = 30
-    base_date = datetime(2024, 1, 1).date()
-
-    rows = []
-    for g in range(n_groups):
-        uid = (g % 15) + 1
-        d = base_date + timedelta(days=g % 28)
-        for k in keys:
-            rows.append({"id": uid, "date": d, "key": k, "value": random.choice(labels)})
 
-    return pl.DataFrame(rows)
+    # One row per (group, key), group-major
+    g = np.arange(n_groups)
+    return pl.DataFrame({
+        "id": np.repeat(g % 15 + 1, len(keys)),
+        "date": np.repeat(np.datetime64("2024-01-01") + (g % 28).astype("timedelta64[D]"), len(keys)),
+        "key": keys * n_groups,
+        "value": _choose(rng, labels, n_groups * len(keys)),
+    })
 
 
-def generate_melt_wide():
+def generate_melt_wide(rng=None):
     """
     Wide-format data for Melt tab testing.
 
@@ -431,49 +495,49 @@ def generate_melt_wide():
     - Pattern-friendly names for regex tests (Q[1-4]_2024, metric_*).
     - Mix of numeric and string (label) for "by type" tests.
     """
-    np.random.seed(52)
-    random.seed(52)
+    if rng is None:
+        rng = np.random.default_rng(52)
 
     n = 80
-    base_date = datetime(2024, 1, 1).date()
     data = {
-        "id": list(range(1, n + 1)),
-        "date": [base_date + timedelta(days=random.randint(0, 365)) for _ in range(n)],
-        "Q1_2024": [round(random.uniform(0, 100), 2) for _ in range(n)],
-        "Q2_2024": [round(random.uniform(0, 100), 2) for _ in range(n)],
-        "Q3_2024": [round(random.uniform(0, 100), 2) for _ in range(n)],
-        "Q4_2024": [round(random.uniform(0, 100), 2) for _ in range(n)],
-        "metric_foo": [round(random.uniform(0, 50), 2) for _ in range(n)],
-        "metric_bar": [round(random.uniform(0, 50), 2) for _ in range(n)],
-        "label": random.choices(["alpha", "beta", "gamma"], k=n),
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "date": np.datetime64("2024-01-01") + rng.integers(0, 366, n).astype("timedelta64[D]"),
+        "Q1_2024": np.round(rng.uniform(0, 100, n), 2),
+        "Q2_2024": np.round(rng.uniform(0, 100, n), 2),
+        "Q3_2024": np.round(rng.uniform(0, 100, n), 2),
+        "Q4_2024": np.round(rng.uniform(0, 100, n), 2),
+        "metric_foo": np.round(rng.uniform(0, 50, n), 2),
+        "metric_bar": np.round(rng.uniform(0, 50, n), 2),
+        "label": _choose(rng, ["alpha", "beta", "gamma"], n),
     }
     return pl.DataFrame(data)
 
 
-def generate_melt_wide_many():
+def generate_melt_wide_many(rng=None):
     """
     Wide-format data with many value columns for Melt "all except index" / pattern stress.
 
     Schema: id, date, col_1, col_2, ..., col_50. All numeric except id/date.
     """
-    np.random.seed(53)
-    random.seed(53)
+    if rng is None:
+        rng = np.random.default_rng(53)
 
     n = 60
     n_cols = 50
-    base_date = datetime(2024, 1, 1).date()
 
     data = {
-        "id": list(range(1, n + 1)),
-        "date": [base_date + timedelta(days=random.randint(0, 200)) for _ in range(n)],
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "date": np.datetime64("2024-01-01") + rng.integers(0, 201, n).astype("timedelta64[D]"),
     }
-    for i in range(1, n_cols + 1):
-        data[f"col_{i}"] = [round(random.uniform(0, 100), 2) for _ in range(n)]
+    # One draw for all value columns; row i of the matrix is col_{i+1}
+    values = np.round(rng.uniform(0, 100, (n_cols, n)), 2)
+    for i in range(n_cols):
+        data[f"col_{i + 1}"] = values[i]
 
     return pl.DataFrame(data)
 
 
-def generate_charting_demo():
+def generate_charting_demo(rng=None):
     """
     Generate daily time-series data for chart view demos and testing.
 
@@ -486,8 +550,8 @@ def generate_charting_demo():
     - customer_count: integer (seasonal + weekday + noise)
     - shark_sightings: integer daily count (low with occasional spikes)
     """
-    np.random.seed(55)
-    random.seed(55)
+    if rng is None:
+        rng = np.random.default_rng(55)
 
     base = datetime(2015, 1, 1).date()
     days = (datetime(2024, 12, 31).date() - base).days + 1
@@ -500,56 +564,49 @@ def generate_charting_demo():
     ]
 
     # Stock market: random walk with slight upward drift and volatility
-    walk = np.zeros(days)
-    walk[0] = 1000.0
-    for i in range(1, days):
-        walk[i] = walk[i - 1] + np.random.normal(0.5, 15.0)
-    stock_market = [round(float(x), 2) for x in walk]
+    steps = np.empty(days)
+    steps[0] = 1000.0
+    steps[1:] = rng.normal(0.5, 15.0, days - 1)
+    stock_market = np.round(np.cumsum(steps), 2)
 
     # High temp: seasonal sine + noise (roughly 30–100 °F)
     t = np.arange(days, dtype=float)
     seasonal = 65.0 + 25.0 * np.sin(2 * np.pi * t / 365.25 - 1.6)
-    noise = np.random.normal(0, 5.0, days)
-    high_temp = [round(float(np.clip(seasonal[i] + noise[i], 25, 105)), 1) for i in range(days)]
+    noise = rng.normal(0, 5.0, days)
+    high_temp = np.round(np.clip(seasonal + noise, 25, 105), 1)
 
-    # 20-day rolling average of high_temp
-    high_temp_arr = np.array(high_temp, dtype=float)
-    avg_20d = np.zeros(days)
-    for i in range(days):
-        lo = max(0, i - 19)
-        avg_20d[i] = high_temp_arr[lo : i + 1].mean()
-    avg_20d_list = [round(float(x), 1) for x in avg_20d]
+    # 20-day rolling average of high_temp (shorter window over the first 19 days)
+    avg_20d = pl.Series(high_temp).rolling_mean(window_size=20, min_samples=1).round(1)
 
     # Customer count: base + weekday effect + seasonal + noise (non-negative int)
     weekday_effect = np.array([0, 0, 0, 0, 10, 25, 15])  # Fri/Sat/Sun higher
     base_cust = 500
-    cust = np.zeros(days)
-    for i in range(days):
-        wd = (base.weekday() + i) % 7
-        seasonal_cust = 80 * np.sin(2 * np.pi * i / 365.25)
-        cust[i] = base_cust + weekday_effect[wd] + seasonal_cust + np.random.normal(0, 30)
-    customer_count = [max(0, int(round(x))) for x in cust]
+    i = np.arange(days)
+    wd = (base.weekday() + i) % 7
+    seasonal_cust = 80 * np.sin(2 * np.pi * i / 365.25)
+    cust = base_cust + weekday_effect[wd] + seasonal_cust + rng.normal(0, 30, days)
+    customer_count = np.clip(np.rint(cust), 0, None).astype(np.int64)
 
     # Shark sightings: low counts, occasional spikes (Poisson-like with rare spikes)
     lam = np.ones(days) * 0.3
     for _ in range(12):
-        idx = random.randint(0, days - 1)
-        lam[idx] = 8.0 + random.uniform(0, 5)
-    shark_sightings = [np.random.poisson(l) for l in lam]
+        idx = rng.integers(0, days)
+        lam[idx] = 8.0 + rng.uniform(0, 5)
+    shark_sightings = rng.poisson(lam)
 
     data = {
         "date": dates,
         "day_of_week": day_of_week,
         "stock_market": stock_market,
         "high_temp": high_temp,
-        "20d_avg_high_temp": avg_20d_list,
+        "20d_avg_high_temp": avg_20d,
         "customer_count": customer_count,
         "shark_sightings": shark_sightings,
     }
     return pl.DataFrame(data)
 
 
-def generate_correlation_matrix_data():
+def generate_correlation_matrix_data(rng=None):
     """
     Generate numeric data with designed pairwise correlations for correlation matrix demos.
 
@@ -560,8 +617,8 @@ def generate_correlation_matrix_data():
     Columns: revenue, profit, operating_cost, margin_pct, unit_volume, price_index,
              growth_rate, market_share, roi, cash_flow
     """
-    np.random.seed(54)
-    random.seed(54)
+    if rng is None:
+        rng = np.random.default_rng(54)
 
     n = 100_000
     col_names = [
@@ -612,7 +669,7 @@ def generate_correlation_matrix_data():
         dtype=np.float64,
     )
 
-    raw = np.random.multivariate_normal(mean, cov, size=n)
+    raw = rng.multivariate_normal(mean, cov, size=n)
 
     # Clip to plausible non-negative ranges where needed (e.g. revenue, profit, %)
     raw[:, 0] = np.clip(raw[:, 0], 1e5, None)   # revenue
@@ -626,35 +683,51 @@ def generate_correlation_matrix_data():
     raw[:, 8] = np.clip(raw[:, 8], -0.2, 0.6)  # roi
     raw[:, 9] = np.clip(raw[:, 9], -5e5, None) # cash_flow can be negative
 
-    data = {col_names[i]: [round(float(x), 4) for x in raw[:, i]] for i in range(k)}
+    data = {col_names[i]: np.round(raw[:, i], 4) for i in range(k)}
     return pl.DataFrame(data)
 
 
-def save_csv(df, filename, **kwargs):
-    """Save DataFrame as CSV, compressed with gzip."""
-    # Remove .csv extension if present, we'll add .csv.gz
+def save_csv(df, filename, gz=True, **kwargs):
+    """Save DataFrame as CSV, compressed with gzip unless gz=False."""
+    # Remove .csv extension if present, we'll add .csv.gz (or .csv)
     base_name = filename.replace('.csv', '')
+    if not gz:
+        filepath = OUTPUT_DIR / f"{base_name}.csv"
+        df.write_csv(filepath, **kwargs)
+        _generated(filepath)
+        return
     filepath = OUTPUT_DIR / f"{base_name}.csv.gz"
 
-    # Write to temporary file first, then compress
-    temp_path = OUTPUT_DIR / f"{base_name}.csv.tmp"
-    df.write_csv(temp_path, **kwargs)
-
-    # Compress the CSV file
-    with open(temp_path, 'rb') as f_in:
-        with gzip.open(filepath, 'wb', compresslevel=6) as f_out:
-            f_out.writelines(f_in)
+    # Write the CSV straight into the gzip stream (no uncompressed temp file)
+    with gzip_open(filepath, 'wb', compresslevel=GZIP_LEVEL) as f_out:
+        df.write_csv(f_out, **kwargs)
 
-    # Remove temporary file
-    temp_path.unlink()
+    _generated(filepath)
 
-    print(f"Generated: {filepath}")
+def save_parquet(df, filename, compression="lz4", compression_level=None, statistics=False, row_group_size=100_000):
+    """Save DataFrame as Parquet.
 
-def save_parquet(df, filename):
-    """Save DataFrame as Parquet."""
+    Defaults favor write speed (lz4, no column statistics) since these are test fixtures;
+    pass compression="zstd" where on-disk size matters and statistics=True where scans should prune row groups.
+    """
     filepath = OUTPUT_DIR / filename
-    df.write_parquet(filepath)
-    print(f"Generated: {filepath}")
+    df.write_parquet(
+        filepath,
+        compression=compression,
+        compression_level=compression_level,
+        statistics=statistics,
+        row_group_size=row_group_size,
+    )
+    _generated(filepath)
+
+
+# For demo files that are read more than written. zstd level 1 is ~10% smaller than lz4 on large_dataset and a
+# third smaller on charting_demo for little extra write time; statistics cost almost nothing to write and let
+# filtered scans skip row groups. (Not for correlation_matrix_demo: random floats barely compress, and there zstd
+# saves 4% but triples decode time.)
+save_parquet_zstd = functools.partial(
+    save_parquet, compression="zstd", compression_level=1, statistics=True, row_group_size=100_000
+)
 
 
 def save_ipc(df, filename):
@@ -662,7 +735,7 @@ def save_ipc(df, filename):
     base = filename.replace(".arrow", "").replace(".ipc", "")
     filepath = OUTPUT_DIR / f"{base}.arrow"
     df.write_ipc(filepath)
-    print(f"Generated: {filepath}")
+    _generated(filepath)
 
 
 def _polars_dtype_to_avro(dtype):
@@ -683,6 +756,21 @@ def _polars_dtype_to_avro(dtype):
     return ["null", "string"]
 
 
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+def _avro_converter(dtype):
+    """Return the function that turns a non-null value of dtype into its Avro value, or None if it passes as is."""
+    if dtype == pl.Date:
+        return lambda val: (val - _EPOCH_DATE).days
+    if dtype in (pl.Datetime("us"), pl.Datetime("ms")):
+        return lambda val: int(val.timestamp() * 1_000_000)
+    if dtype in (pl.Int64, pl.Float64, pl.Utf8, pl.Boolean):
+        return None
+    # fallback (written as string, see _polars_dtype_to_avro)
+    return lambda val: val.isoformat() if hasattr(val, "isoformat") else val
+
+
 def save_avro(df, filename):
     """Save DataFrame as Avro (requires fastavro)."""
     if fastavro is None:
@@ -697,29 +785,19 @@ def save_avro(df, filename):
     schema = {"type": "record", "name": "Record", "fields": fields}
     parsed = fastavro.parse_schema(schema)
 
-    epoch_date = date(1970, 1, 1)
-
-    def row_to_record(row):
-        record = {}
-        for i, name in enumerate(df.columns):
-            val = row[i]
-            dtype = df.schema[name]
-            if val is None:
-                record[name] = None
-            elif dtype == pl.Date and isinstance(val, date):
-                record[name] = (val - epoch_date).days
-            elif dtype in (pl.Datetime("us"), pl.Datetime("ms")) and hasattr(val, "timestamp"):
-                record[name] = int(val.timestamp() * 1_000_000)
-            elif hasattr(val, "isoformat"):
-                record[name] = val.isoformat()
-            else:
-                record[name] = val
-        return record
-
-    records = [row_to_record(row) for row in df.iter_rows()]
+    # Resolve each column's conversion once, then stream records to fastavro instead of building a list
+    names = df.columns
+    converters = [_avro_converter(df.schema[name]) for name in names]
+    records = (
+        {
+            name: val if conv is None or val is None else conv(val)
+            for name, conv, val in zip(names, converters, row)
+        }
+        for row in df.iter_rows()
+    )
     with open(filepath, "wb") as out:
         fastavro.writer(out, parsed, records, codec="deflate")
-    print(f"Generated: {filepath}")
+    _generated(filepath)
 
 
 def save_excel(df, filename):
@@ -728,137 +806,275 @@ def save_excel(df, filename):
         print("Skipping Excel (openpyxl not installed):", filename)
         return
     filepath = OUTPUT_DIR / filename
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    if ws is None:
-        return
-    for c, name in enumerate(df.columns, 1):
-        ws.cell(row=1, column=c, value=name)
-    for r in range(df.height):
-        row = df.row(r)
-        for c, val in enumerate(row, 1):
-            if hasattr(val, "isoformat"):
-                val = val.isoformat()
-            ws.cell(row=r + 2, column=c, value=val)
+    # Write-only mode streams rows out instead of building a Cell object per value
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet")
+    ws.append(df.columns)
+    for row in df.iter_rows():
+        ws.append([val.isoformat() if hasattr(val, "isoformat") else val for val in row])
     wb.save(filepath)
-    print(f"Generated: {filepath}")
+    _generated(filepath)
 
 
-def main():
-    print("Generating sample data files...")
-    print(f"Output directory: {OUTPUT_DIR}")
+# One thread per format written by _save_all_formats; more would only queue behind them
+_IO_POOL_WORKERS = 5
+
+
+@functools.cache
+def _io_pool():
+    """Per-process thread pool for CSV/Parquet writes (they are independent and mostly run outside the GIL)."""
+    return ThreadPoolExecutor(max_workers=_IO_POOL_WORKERS)
+
+
+def _write_concurrently(*jobs):
+    """Run (save_fn, df, filename) jobs on the I/O pool and wait for all of them; re-raises the first failure."""
+    futures = [_io_pool().submit(fn, df, filename) for fn, df, filename in jobs]
+    for future in futures:
+        future.result()
 
-    # People data for grouping
+
+def _save_all_formats(df, base):
+    """Write df as CSV, Parquet, Arrow IPC, Avro and Excel under the given base name.
+
+    All five run on the I/O pool: the Polars writers release the GIL, so they overlap the pure-Python Avro and
+    Excel writers.
+    """
+    _write_concurrently(
+        (save_csv, df, f"{base}.csv"),
+        (save_parquet, df, f"{base}.parquet"),
+        (save_ipc, df, f"{base}.arrow"),
+        (save_avro, df, f"{base}.avro"),
+        (save_excel, df, f"{base}.xlsx"),
+    )
+
+
+# Each task generates one group of files. Tasks share no state and write disjoint files, so main() runs them
+# in separate processes.
+
+
+def _task_people():
     print("\n1. Generating people data...")
-    people_df = generate_people_data()
-    save_csv(people_df, "people.csv")
-    save_parquet(people_df, "people.parquet")
-    save_ipc(people_df, "people.arrow")
-    save_avro(people_df, "people.avro")
-    save_excel(people_df, "people.xlsx")
-
-    # Sales data for aggregates
+    _save_all_formats(generate_people_data(), "people")
+
+
+def _task_sales():
     print("\n2. Generating sales data...")
-    sales_df = generate_sales_data()
-    save_csv(sales_df, "sales.csv")
-    save_parquet(sales_df, "sales.parquet")
-    save_ipc(sales_df, "sales.arrow")
-    save_avro(sales_df, "sales.avro")
-    save_excel(sales_df, "sales.xlsx")
-
-    # Mixed types
+    _save_all_formats(generate_sales_data(), "sales")
+
+
+def _task_mixed_types():
     print("\n3. Generating mixed types data...")
     mixed_df = generate_mixed_types()
-    save_csv(mixed_df, "mixed_types.csv")
-    save_parquet(mixed_df, "mixed_types.parquet")
-    save_ipc(mixed_df, "mixed_types.arrow")
-    save_avro(mixed_df, "mixed_types.avro")
-    save_excel(mixed_df, "mixed_types.xlsx")
+    _save_all_formats(mixed_df, "mixed_types")
 
     # Generate a small uncompressed CSV for testing (3 columns, good coverage)
     print("\n3a. Generating small test CSV (uncompressed)...")
-    test_df = generate_mixed_types()  # Reuse mixed_types as it has good coverage
-    # Save uncompressed version
-    test_filepath = OUTPUT_DIR / "3-sfd-header.csv"
-    test_df.write_csv(test_filepath)
-    print(f"Generated: {test_filepath}")
+    # Reuse mixed_types as it has good coverage
+    save_csv(mixed_df, "3-sfd-header.csv", gz=False)
+
 
-    # Quoted strings
+def _task_quoted_strings():
     print("\n4. Generating quoted strings data...")
     quoted_df = generate_quoted_strings()
     save_csv(quoted_df, "quoted_strings.csv")
-    # For unquoted, we'll just save without special quoting (Polars handles this)
-    save_csv(quoted_df, "unquoted_strings.csv")
+    # The unquoted variant uses Polars' default (quote only when needed), which is byte-identical; copy it
+    unquoted_path = OUTPUT_DIR / "unquoted_strings.csv.gz"
+    shutil.copyfile(OUTPUT_DIR / "quoted_strings.csv.gz", unquoted_path)
+    _generated(unquoted_path)
+
 
-    # Empty table
+def _task_empty():
     print("\n5. Generating empty table...")
-    empty_df = generate_empty_table()
-    save_csv(empty_df, "empty.csv")
-    save_parquet(empty_df, "empty.parquet")
-    save_ipc(empty_df, "empty.arrow")
-    save_avro(empty_df, "empty.avro")
-    save_excel(empty_df, "empty.xlsx")
-
-    # Single row
+    _save_all_formats(generate_empty_table(), "empty")
+
+
+def _task_single_row():
     print("\n6. Generating single row table...")
-    single_df = generate_single_row()
-    save_csv(single_df, "single_row.csv")
-    save_parquet(single_df, "single_row.parquet")
-    save_ipc(single_df, "single_row.arrow")
-    save_avro(single_df, "single_row.avro")
-    save_excel(single_df, "single_row.xlsx")
-
-    # Large dataset
+    _save_all_formats(generate_single_row(), "single_row")
+
+
+def _task_large_dataset():
     print("\n7. Generating large dataset...")
     large_df = generate_large_dataset()
-    save_csv(large_df, "large_dataset.csv")
-    save_parquet(large_df, "large_dataset.parquet")
+    _write_concurrently((save_csv, large_df, "large_dataset.csv"), (save_parquet_zstd, large_df, "large_dataset.parquet"))
+
 
-    # Error cases
+def _task_error_cases():
     print("\n8. Generating error case files...")
     error_cases = generate_error_cases()
     for name, df in error_cases.items():
-        save_csv(df, f"error_{name}.csv")
+        jobs = [(save_csv, df, f"error_{name}.csv")]
         # Skip parquet for inconsistent_types as it can't handle mixed types
         if name != "inconsistent_types":
-            save_parquet(df, f"error_{name}.parquet")
+            jobs.append((save_parquet, df, f"error_{name}.parquet"))
+        _write_concurrently(*jobs)
+
 
-    # Pivot and Melt testing
+def _task_pivot_melt():
     print("\n9. Generating pivot and melt testing data...")
-    pivot_long_df = generate_pivot_long()
-    save_csv(pivot_long_df, "pivot_long.csv")
-    save_parquet(pivot_long_df, "pivot_long.parquet")
-    save_ipc(pivot_long_df, "pivot_long.arrow")
-    save_avro(pivot_long_df, "pivot_long.avro")
-    save_excel(pivot_long_df, "pivot_long.xlsx")
+    _save_all_formats(generate_pivot_long(), "pivot_long")
     pivot_long_string_df = generate_pivot_long_string()
-    save_csv(pivot_long_string_df, "pivot_long_string.csv")
-    save_parquet(pivot_long_string_df, "pivot_long_string.parquet")
-    melt_wide_df = generate_melt_wide()
-    save_csv(melt_wide_df, "melt_wide.csv")
-    save_parquet(melt_wide_df, "melt_wide.parquet")
-    save_ipc(melt_wide_df, "melt_wide.arrow")
-    save_avro(melt_wide_df, "melt_wide.avro")
-    save_excel(melt_wide_df, "melt_wide.xlsx")
+    _write_concurrently(
+        (save_csv, pivot_long_string_df, "pivot_long_string.csv"),
+        (save_parquet, pivot_long_string_df, "pivot_long_string.parquet"),
+    )
+    _save_all_formats(generate_melt_wide(), "melt_wide")
     melt_wide_many_df = generate_melt_wide_many()
-    save_csv(melt_wide_many_df, "melt_wide_many.csv")
-    save_parquet(melt_wide_many_df, "melt_wide_many.parquet")
+    _write_concurrently(
+        (save_csv, melt_wide_many_df, "melt_wide_many.csv"),
+        (save_parquet, melt_wide_many_df, "melt_wide_many.parquet"),
+    )
 
+
+def _task_charting_demo():
     # Charting demo (10 years daily time series)
     print("\n10. Generating charting demo data...")
-    chart_df = generate_charting_demo()
-    save_parquet(chart_df, "charting_demo.parquet")
+    save_parquet_zstd(generate_charting_demo(), "charting_demo.parquet")
+
 
+def _task_correlation_matrix():
     # Correlation matrix demo (Parquet only: 100k rows, 10 numeric columns)
     print("\n11. Generating correlation matrix demo data...")
-    corr_df = generate_correlation_matrix_data()
-    save_parquet(corr_df, "correlation_matrix_demo.parquet")
+    save_parquet(generate_correlation_matrix_data(), "correlation_matrix_demo.parquet")
+
 
+def _task_infer_schema_length():
     # Infer schema length demo (CSV only: 200 rows, 100 ints, then "N/A", then 100 more ints)
     print("\n12. Generating infer schema length demo data...")
-    infer_schema_length_data = generate_infer_schema_length_data()
-    save_infer_schema_length_data(infer_schema_length_data, "infer_schema_length_data.csv")
+    save_infer_schema_length_data(generate_infer_schema_length_data(), "infer_schema_length_data.csv")
+
+
+# Largest first, so the long-running task starts immediately and the small ones fill the other workers
+TASKS = [
+    _task_large_dataset,
+    _task_correlation_matrix,
+    _task_people,
+    _task_sales,
+    _task_mixed_types,
+    _task_quoted_strings,
+    _task_empty,
+    _task_single_row,
+    _task_error_cases,
+    _task_pivot_melt,
+    _task_charting_demo,
+    _task_infer_schema_length,
+]
+
+
+def _referenced_names(code):
+    """Global names used by a code object, including nested lambdas and comprehensions."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced_names(const)
+    return names
+
+
+def _task_digest(task):
+    """Hash of everything that determines a task's output.
+
+    That is the source of the task and of every function in this module it reaches, the simple module constants
+    they read (e.g. GZIP_LEVEL), the Polars/NumPy versions and which optional writers are available. The generators are seeded, so the same inputs
+    produce the same data.
+    """
+    env = f"polars={pl.__version__} numpy={np.__version__} fastavro={fastavro is not None} openpyxl={openpyxl is not None}"
+    h = hashlib.blake2b(env.encode(), digest_size=16)
+    module = globals()
+    seen = set()
+    pending = [task.__name__]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        obj = module[name]
+        if inspect.isfunction(obj) and obj.__module__ == __name__:
+            h.update(inspect.getsource(obj).encode())
+            pending.extend(sorted(n for n in _referenced_names(obj.__code__) if n in module and n not in seen))
+        elif isinstance(obj, functools.partial):
+            h.update(f"{name}=partial({obj.func.__name__}, {obj.args!r}, {obj.keywords!r})".encode())
+            pending.append(obj.func.__name__)
+        elif isinstance(obj, (int, float, str, tuple)):
+            h.update(f"{name}={obj!r}".encode())
+    return h.hexdigest()
+
+
+def _read_stamp():
+    """Per-task stamp entries ({task name: {"digest": ..., "files": [...]}}), or {} if missing or unreadable."""
+    try:
+        tasks = json.loads(STAMP_FILE.read_text()).get("tasks")
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return tasks if isinstance(tasks, dict) else {}
+
+
+def _write_stamp(entries):
+    STAMP_FILE.write_text(json.dumps({"tasks": entries}, indent=2, sort_keys=True) + "\n")
+
+
+def _is_up_to_date(entry, digest):
+    """True if the entry was written by this exact code and every file it lists still exists."""
+    entry = entry or {}
+    files = entry.get("files") or []
+    return entry.get("digest") == digest and bool(files) and all((OUTPUT_DIR / name).is_file() for name in files)
+
+
+def _run_task(task):
+    """Run a task in a worker process and return the names of the files it wrote."""
+    with _written_lock:
+        _written.clear()
+    task()
+    with _written_lock:
+        return sorted(set(_written))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sample data files for datui testing.")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the files are up to date")
+    args = parser.parse_args(argv)
+
+    print("Generating sample data files...")
+    print(f"Output directory: {OUTPUT_DIR}")
+
+    digests = {task.__name__: _task_digest(task) for task in TASKS}
+    entries = {name: entry for name, entry in _read_stamp().items() if name in digests}
+    stale = [
+        task for task in TASKS
+        if args.force or not _is_up_to_date(entries.get(task.__name__), digests[task.__name__])
+    ]
+    if not stale:
+        print("Sample data is up to date (use --force to regenerate).")
+        return
+    skipped = len(TASKS) - len(stale)
+    if skipped:
+        print(f"Skipping {skipped} task(s) whose files are up to date.")
+
+    # Drop the stale entries first so an interrupted run is never mistaken for a complete one
+    for task in stale:
+        entries.pop(task.__name__, None)
+    _write_stamp(entries)
+
+    # "spawn" rather than fork: forking after Polars has started its thread pool can deadlock
+    cpus = os.cpu_count() or 1
+    workers = min(len(stale), cpus)
+    # Share the cores between the workers' Polars thread pools instead of giving each one a thread per core.
+    # Spawned workers copy the environment when they start, before they import Polars, so the limit is only set
+    # while the pool is alive and then restored for the caller. An explicit setting is left alone.
+    saved_max_threads = os.environ.get("POLARS_MAX_THREADS")
+    if not saved_max_threads:
+        os.environ["POLARS_MAX_THREADS"] = str(max(1, cpus // workers))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            futures = [(task.__name__, ex.submit(_run_task, task)) for task in stale]
+            for name, future in futures:
+                entries[name] = {"digest": digests[name], "files": future.result()}
+    finally:
+        if saved_max_threads is None:
+            os.environ.pop("POLARS_MAX_THREADS", None)
+        else:
+            os.environ["POLARS_MAX_THREADS"] = saved_max_threads
 
+    _write_stamp(entries)
     print("\nSample data generation complete!")
 
 if __name__ == "__main__":
@@ -4,7 +4,8 @@ Development environment setup script for datui.
 
 This script:
 - Creates and manages a Python virtual environment (.venv)
-- Installs Python dependencies from scripts/requirements.txt (and requirements-wheel.txt on Linux/macOS)
+- Installs Python dependencies from scripts/requirements.txt (and requirements-wheel.txt on Linux/macOS),
+  using uv if it is available
 - Installs/updates pre-commit hooks
 - Ensures mdbook is installed at the correct version (matching CI)
 - Regenerates test data
@@ -17,10 +18,16 @@ with maturin. See the final "Next steps" output for build/test commands.
 Can be run multiple times safely - it's idempotent and non-destructive.
 """
 
+import collections
+import functools
 import os
+import runpy
 import sys
 import subprocess
 import shutil
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -33,39 +40,107 @@ REQUIREMENTS_WHEEL_FILE = Path(__file__).parent / "requirements-wheel.txt"
 REQUIREMENTS_WHEEL_WINDOWS_FILE = Path(__file__).parent / "requirements-wheel-windows.txt"
 MDBOOK_VERSION = "0.5.2"  # Must match .github/workflows/ci.yml and release.yml
 
+IS_WINDOWS = sys.platform == "win32"
+
+# Executables inside the venv, resolved once
+VENV_BIN = VENV_DIR / ("Scripts" if IS_WINDOWS else "bin")
+VENV_PYTHON = VENV_BIN / ("python.exe" if IS_WINDOWS else "python")
+VENV_PIP = VENV_BIN / "pip"
+VENV_PRE_COMMIT = VENV_BIN / ("pre-commit.exe" if IS_WINDOWS else "pre-commit")
+
 
 def get_venv_python():
     """Get the path to the venv's Python executable."""
-    if sys.platform == "win32":
-        return VENV_DIR / "Scripts" / "python.exe"
-    else:
-        return VENV_DIR / "bin" / "python"
+    return VENV_PYTHON
 
 
 def get_venv_pip():
     """Get the path to the venv's pip executable."""
-    if sys.platform == "win32":
-        return VENV_DIR / "Scripts" / "pip"
+    return VENV_PIP
+
+
+def run_command(cmd, check=True, cwd=None, env=None, stdin=None, quiet=False, out=None):
+    """Run a command, streaming its output, and return the result.
+
+    Output is echoed line by line as it arrives rather than buffered until the
+    command exits, so long installs (pip, cargo) show progress. Only the last
+    lines are kept, to repeat on failure.
+
+    With quiet=True (for short commands whose output is noise, like the pip
+    upgrade), stdout is discarded and stderr is collected as bytes and only
+    decoded and printed if the command fails.
+
+    out redirects everything this prints (default: stdout, errors to stderr).
+    """
+    print(f"Running: {' '.join(cmd) if isinstance(cmd, list) else cmd}", file=out)
+    popen_kwargs = dict(shell=isinstance(cmd, str), cwd=cwd or REPO_ROOT, env=env, stdin=stdin)
+    if quiet:
+        with subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, **popen_kwargs) as proc:
+            _, stderr = proc.communicate()
+        tail = stderr.decode(errors="replace").splitlines(keepends=True)[-200:] if proc.returncode else []
     else:
-        return VENV_DIR / "bin" / "pip"
+        tail = collections.deque(maxlen=200)
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True,
+            **popen_kwargs
+        ) as proc:
+            for line in proc.stdout:
+                (out or sys.stdout).write(line)
+                tail.append(line)
+    result = subprocess.CompletedProcess(cmd, proc.returncode)
+    if result.returncode != 0:
+        print(f"Error output (last {len(tail)} lines):\n{''.join(tail)}", file=out or sys.stderr)
+        if check:
+            raise subprocess.CalledProcessError(result.returncode, cmd, output="".join(tail))
+    return result
 
 
-def run_command(cmd, check=True, cwd=None, env=None, stdin=None):
-    """Run a command and return the result."""
-    print(f"Running: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-    result = subprocess.run(
+def _run_capture(cmd):
+    """Run a short command (e.g. a version probe) and return its captured output."""
+    return subprocess.run(
         cmd,
-        shell=isinstance(cmd, str),
-        check=check,
-        cwd=cwd or REPO_ROOT,
-        env=env,
-        stdin=stdin,
+        check=False,
+        cwd=REPO_ROOT,
         capture_output=True,
         text=True
     )
-    if result.returncode != 0:
-        print(f"Error output: {result.stderr}", file=sys.stderr)
-    return result
+
+
+class DeferredOutput:
+    """Text stream for a background step: holds its output until release(), then writes straight to stdout.
+
+    Keeps a background step's output from interleaving with the steps running in the foreground.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._released = False
+
+    def write(self, text):
+        with self._lock:
+            if self._released:
+                sys.stdout.write(text)
+            else:
+                self._buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            if self._released:
+                sys.stdout.flush()
+
+    def release(self):
+        """Print everything held so far and pass later output through."""
+        with self._lock:
+            sys.stdout.write("".join(self._buffer))
+            self._buffer.clear()
+            self._released = True
+            sys.stdout.flush()
 
 
 def create_venv():
@@ -83,7 +158,7 @@ def create_venv():
 def ensure_venv_activated():
     """Check if we're running in the venv, and provide instructions if not."""
     venv_python = get_venv_python()
-    if not venv_python.exists():
+    if not venv_python.is_file():
         print("Error: Virtual environment Python not found. Please run this script again.")
         sys.exit(1)
 
@@ -92,7 +167,7 @@ def ensure_venv_activated():
     if current_python != venv_python.resolve():
         print(f"Note: Not running in venv. The script will use {venv_python} for commands.")
         print("   For interactive use, activate the venv with:")
-        if sys.platform == "win32":
+        if IS_WINDOWS:
             print(f"   {VENV_DIR}\\Scripts\\activate")
         else:
             print(f"   source {VENV_DIR}/bin/activate")
@@ -102,37 +177,43 @@ def upgrade_pip():
     """Upgrade pip in the virtual environment."""
     print("Upgrading pip...")
     venv_pip = get_venv_pip()
-    run_command([str(venv_pip), "install", "--upgrade", "pip", "--quiet"])
+    run_command([str(venv_pip), "install", "--upgrade", "pip", "--quiet"], quiet=True)
 
 
 def install_requirements():
-    """Install Python requirements from scripts/requirements.txt."""
+    """Install Python requirements from scripts/requirements.txt and the wheel build requirements.
+
+    Both files go to a single install so the resolver runs once. uv is used when it is on PATH (much faster
+    resolution and downloads), otherwise the venv's pip.
+    """
     if not REQUIREMENTS_FILE.exists():
         print(f"Warning: {REQUIREMENTS_FILE} not found. Skipping requirements installation.")
         return
 
-    print(f"Installing requirements from {REQUIREMENTS_FILE}...")
-    venv_pip = get_venv_pip()
-    run_command([str(venv_pip), "install", "-r", str(REQUIREMENTS_FILE)])
-    print("Requirements installed")
-
+    requirement_files = [REQUIREMENTS_FILE]
     # Wheel build deps: Linux/macOS use patchelf + maturin + pytest; Windows uses maturin + pytest only
-    if sys.platform == "win32":
+    if IS_WINDOWS:
         wheel_file = REQUIREMENTS_WHEEL_WINDOWS_FILE
     else:
         wheel_file = REQUIREMENTS_WHEEL_FILE
     if wheel_file.exists():
-        print(f"Installing wheel build deps from {wheel_file.name}...")
-        run_command([str(venv_pip), "install", "-r", str(wheel_file)])
-        print("Wheel build requirements installed")
+        requirement_files.append(wheel_file)
+
+    print(f"Installing requirements from {', '.join(f.name for f in requirement_files)}...")
+    uv_path = shutil.which("uv")
+    if uv_path:
+        cmd = [uv_path, "pip", "install", "--python", str(get_venv_python())]
+    else:
+        cmd = [str(get_venv_pip()), "install"]
+    for requirement_file in requirement_files:
+        cmd += ["-r", str(requirement_file)]
+    run_command(cmd)
+    print("Requirements installed")
 
 
 def get_venv_pre_commit():
     """Get the path to the venv's pre-commit executable."""
-    if sys.platform == "win32":
-        return VENV_DIR / "Scripts" / "pre-commit.exe"
-    else:
-        return VENV_DIR / "bin" / "pre-commit"
+    return VENV_PRE_COMMIT
 
 
 def install_pre_commit_hooks():
@@ -149,7 +230,7 @@ def install_pre_commit_hooks():
     venv_pre_commit = get_venv_pre_commit()
 
     # Check if pre-commit is installed in venv
-    if not venv_pre_commit.exists():
+    if not venv_pre_commit.is_file():
         # Try to find it in PATH (might be installed globally)
         pre_commit_path = shutil.which("pre-commit")
         if not pre_commit_path:
@@ -163,7 +244,8 @@ def install_pre_commit_hooks():
     # Run pre-commit install
     result = run_command(
         pre_commit_cmd + ["install"],
-        check=False
+        check=False,
+        quiet=True
     )
 
     if result.returncode == 0:
@@ -173,8 +255,9 @@ def install_pre_commit_hooks():
         print("  You can manually run: pre-commit install")
 
 
+@functools.cache
 def find_mdbook():
-    """Find mdbook executable in common locations."""
+    """Find mdbook executable in common locations (cached; see install_mdbook)."""
     # Check PATH first
     mdbook_path = shutil.which("mdbook")
     if mdbook_path:
@@ -182,20 +265,21 @@ def find_mdbook():
 
     # Check common cargo install location
     cargo_bin = Path.home() / ".cargo" / "bin" / "mdbook"
-    if cargo_bin.exists():
+    if cargo_bin.is_file():
         return str(cargo_bin)
 
     return None
 
 
+@functools.cache
 def check_mdbook_installed():
-    """Check if mdbook is installed and return the version, or None if not installed."""
+    """Check if mdbook is installed and return the version, or None if not installed (cached; see install_mdbook)."""
     mdbook_path = find_mdbook()
     if not mdbook_path:
         return None
 
     try:
-        result = run_command([mdbook_path, "--version"], check=False)
+        result = _run_capture([mdbook_path, "--version"])
         if result.returncode == 0:
             # mdbook --version outputs something like "mdbook v0.5.2"
             version_line = result.stdout.strip()
@@ -209,47 +293,52 @@ def check_mdbook_installed():
     return None
 
 
-def install_mdbook():
-    """Install mdbook at the correct version using cargo."""
-    print(f"Checking mdbook installation (required version: {MDBOOK_VERSION})...")
+def install_mdbook(out=None):
+    """Install mdbook at the correct version using cargo. Output goes to out (default: stdout)."""
+    print(f"Checking mdbook installation (required version: {MDBOOK_VERSION})...", file=out)
 
     installed_version = check_mdbook_installed()
 
     if installed_version == MDBOOK_VERSION:
-        print(f"mdbook {MDBOOK_VERSION} is already installed")
+        print(f"mdbook {MDBOOK_VERSION} is already installed", file=out)
         return
 
     if installed_version:
-        print(f"  Found mdbook {installed_version}, but need {MDBOOK_VERSION}")
-        print(f"  Installing mdbook {MDBOOK_VERSION}...")
+        print(f"  Found mdbook {installed_version}, but need {MDBOOK_VERSION}", file=out)
+        print(f"  Installing mdbook {MDBOOK_VERSION}...", file=out)
     else:
-        print(f"  mdbook not found. Installing mdbook {MDBOOK_VERSION}...")
+        print(f"  mdbook not found. Installing mdbook {MDBOOK_VERSION}...", file=out)
 
     # Check if cargo is available
-    cargo_result = run_command(["cargo", "--version"], check=False)
+    cargo_result = _run_capture(["cargo", "--version"])
     if cargo_result.returncode != 0:
-        print("Error: cargo is not installed or not in PATH.")
-        print("Please install Rust and cargo first: https://rustup.rs/")
+        print("Error: cargo is not installed or not in PATH.", file=out)
+        print("Please install Rust and cargo first: https://rustup.rs/", file=out)
         sys.exit(1)
 
-    # Install mdbook
-    print(f"  Running: cargo install mdbook --version {MDBOOK_VERSION} --locked")
+    # Install mdbook (streamed: it compiles from source, so progress output matters)
+    print("  Building mdbook from source; this may take several minutes...", file=out)
     result = run_command(
         ["cargo", "install", "mdbook", "--version", MDBOOK_VERSION, "--locked"],
-        check=False
+        check=False,
+        out=out
     )
 
     if result.returncode != 0:
-        print("Error: Failed to install mdbook. Please check the error messages above.")
+        print("Error: Failed to install mdbook. Please check the error messages above.", file=out)
         sys.exit(1)
 
+    # The cached lookups predate the install
+    find_mdbook.cache_clear()
+    check_mdbook_installed.cache_clear()
+
     # Verify installation
     installed_version = check_mdbook_installed()
     if installed_version == MDBOOK_VERSION:
-        print(f"mdbook {MDBOOK_VERSION} installed successfully")
+        print(f"mdbook {MDBOOK_VERSION} installed successfully", file=out)
     else:
-        print(f"Warning: mdbook was installed but version check failed.")
-        print(f"  Expected: {MDBOOK_VERSION}, Got: {installed_version}")
+        print(f"Warning: mdbook was installed but version check failed.", file=out)
+        print(f"  Expected: {MDBOOK_VERSION}, Got: {installed_version}", file=out)
 
 
 def regenerate_test_data():
@@ -266,6 +355,37 @@ def regenerate_test_data():
     print("Test data regenerated")
 
 
+def run_script(script):
+    """Run a Python script in this interpreter as if invoked with no arguments, and return its exit code.
+
+    Saves starting another interpreter per script. Only if the script cannot be loaded (read or compiled) does
+    this fall back to a subprocess; an exception raised while it runs is reported as a failure, like a
+    non-zero exit, rather than running the build a second time.
+    """
+    print(f"Running: {script}")
+    try:
+        compile(Path(script).read_bytes(), str(script), "exec")
+    except (OSError, SyntaxError, ValueError) as e:
+        print(f"Warning: could not load {script.name} in-process ({e!r}); running it in a subprocess")
+        return run_command([sys.executable, str(script)], check=False, stdin=subprocess.DEVNULL).returncode
+
+    saved_argv = sys.argv
+    sys.argv = [str(script)]
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
 def build_local_documentation():
     """Build local documentation using the build script."""
     print("Building local documentation...")
@@ -282,23 +402,14 @@ def build_local_documentation():
         print("  Documentation will be built after mdbook is installed.")
         return
 
-    # Ensure mdbook is in PATH for the script
-    env = os.environ.copy()
-    if mdbook_path and str(Path(mdbook_path).parent) not in env.get("PATH", ""):
-        cargo_bin = str(Path(mdbook_path).parent)
-        if sys.platform == "win32":
-            env["PATH"] = f"{cargo_bin};{env.get('PATH', '')}"
-        else:
-            env["PATH"] = f"{cargo_bin}:{env.get('PATH', '')}"
+    # Ensure mdbook is in PATH for the script (and anything it runs)
+    mdbook_dir = str(Path(mdbook_path).parent)
+    if mdbook_dir not in os.environ.get("PATH", "").split(os.pathsep):
+        os.environ["PATH"] = f"{mdbook_dir}{os.pathsep}{os.environ.get('PATH', '')}"
 
-    result = run_command(
-        [sys.executable, str(doc_script)],
-        check=False,
-        env=env,
-        stdin=subprocess.DEVNULL
-    )
+    returncode = run_script(doc_script)
 
-    if result.returncode != 0:
+    if returncode != 0:
         print("Warning: Documentation build had errors. Check output above.")
         print("  You can manually run: python3 scripts/docs/build_single_version_docs.py [VERSION]")
         return
@@ -309,13 +420,7 @@ def build_local_documentation():
     # Rebuild index page (book/index.html)
     index_script = Path(__file__).parent / "docs" / "rebuild_index.py"
     if index_script.exists():
-        index_result = run_command(
-            [sys.executable, str(index_script)],
-            check=False,
-            env=env,
-            stdin=subprocess.DEVNULL
-        )
-        if index_result.returncode == 0:
+        if run_script(index_script) == 0:
             print("Documentation index page updated")
         else:
             print("Warning: rebuild_index.py had errors. Index page may be missing or stale.")
@@ -339,12 +444,6 @@ def main():
     # Check venv activation status
     ensure_venv_activated()
 
-    # Get venv Python for subsequent commands
-    venv_python = get_venv_python()
-    if not venv_python.exists():
-        print("Error: Virtual environment Python executable not found.")
-        sys.exit(1)
-
     # Upgrade pip (especially important for new venvs)
     if venv_created:
         upgrade_pip()
@@ -352,14 +451,33 @@ def main():
     # Install/update requirements
     install_requirements()
 
-    # Install/update pre-commit hooks
-    install_pre_commit_hooks()
-
-    # Install mdbook
-    install_mdbook()
-
-    # Regenerate test data
-    regenerate_test_data()
+    # Install mdbook in the background: it is independent of the next two steps, and a cargo build can take
+    # minutes. Its output is held back until those steps are done so the two don't interleave. The executor
+    # (rather than a bare Thread) re-raises its failures, including sys.exit, on result().
+    mdbook_output = DeferredOutput()
+    executor = ThreadPoolExecutor(max_workers=1)
+    mdbook_future = executor.submit(install_mdbook, out=mdbook_output)
+    try:
+        # Install/update pre-commit hooks
+        install_pre_commit_hooks()
+
+        # Regenerate test data
+        regenerate_test_data()
+    except BaseException:
+        # Fail now rather than after the mdbook build finishes, but keep showing the build's output while the
+        # process waits for it to exit
+        print("Setup failed; the background mdbook install will finish before the script exits.", file=sys.stderr)
+        mdbook_output.release()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    # The docs build needs mdbook
+    print("Waiting for the mdbook installation...")
+    mdbook_output.release()
+    try:
+        mdbook_future.result()
+    finally:
+        executor.shutdown()
 
     # Build local documentation
     build_local_documentation()
@@ -370,7 +488,7 @@ def main():
     print("=" * 60)
     print()
     print("To activate the virtual environment:")
-    if sys.platform == "win32":
+    if IS_WINDOWS:
         print(f"  {VENV_DIR}\\Scripts\\activate")
     else:
         print(f"  source {VENV_DIR}/bin/activate")